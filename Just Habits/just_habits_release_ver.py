@@ -8,18 +8,71 @@ import tkinter as tk
 from tkinter import messagebox
 import json
 import datetime as dt
+import gzip
+import os
+import copy
+import uuid
+import contextlib
+import argparse
+import asyncio
+import collections
+import http.client
+import time
+import urllib.parse
+import bisect
+import csv
+import sys
+import array
+import re
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 HABIT_FILE_NAME = "habits.json"
 STREAK_FILE_NAME = "streak.txt"
+ARCHIVE_DIR_NAME = "archive"
+STREAK_INDEX_FILE_NAME = "streak_index.json"
+LOCK_FILE_NAME = "habits.lock"
+SYNC_STATE_FILE_NAME = "sync_state.json"
+SYNC_RELAY_DIR_NAME = "sync_relay"
+REPLICA_ID_PATTERN = "[0-9a-f]{32}"  # Replica ids are uuid hex strings, also used as directory names
+LOCAL_HABIT_FIELDS = ("checked", "week_checks")  # Habit fields that only hold for one day and are not synced
+VALUE_FILE_NAME = "habit_values.json"
+
+FILE_CHECK_INTERVAL = 2000  # Milliseconds between checks for changes to the data files
+
+PROFILE_ENV_VAR = "JUST_HABITS_PROFILE"  # Set to a file name to write a profiling trace
+
+DAEMON_HOST = "127.0.0.1"  # The daemon only listens on the loopback interface
+DAEMON_PORT = 8765
+DAEMON_PERSIST_INTERVAL = 5  # Seconds between writes of changed habits to file
+DAEMON_LATENCY_SAMPLES = 1000  # Number of recent request latencies kept per route
+DAEMON_MAX_BODY_SIZE = 1024 * 1024  # Largest request body in bytes the daemon reads
 
 NORMAL_BACKGROUND_COLOR = "#e4e7e7"
 NORMAL_TEXT_COLOR = "#e4e7e7"
 HIGHLIGHT_BACKGROUND_COLOR = "#fffab3"
 HIGHLIGHT_TEXT_COLOR = "#fffab3"
 
+WEEKDAYS_MONDAY_FIRST = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]  # Weekday names in date.weekday() order
+
 DEFAULT_FONT = "Cascadia Mono"
 
 GRACE_PERIOD = 2  # Number of days before streak reset
+RECURRENCE_LOOKAHEAD_DAYS = 7  # Number of days covered by the RecurrenceIndex, starting today
+
+ROLLING_WINDOWS = (7, 30, 365)  # Number of days covered by the rolling sums of quantitative habits
+DURATION_STEP = 5  # Minutes added or removed by one click on a duration habit
+
+IMPORT_BATCH_SIZE = 10000  # Number of imported check-ins held in memory before they are written
+IMPORT_ERROR_LIMIT = 20  # Number of invalid rows reported after an import
+EXPORT_FIELDS = ["type", "id", "name", "note", "weekdays", "highlight", "recurrence", "kind", "target", "group", "date", "value"]  # Columns of a csv export
+
+profile_events = None  # Recorded trace events, None while profiling is disabled
+compiled_rules = {}  # The last recurrence rule of every habit and its compiled form: {id: tuple[dict, dict]}
 
 
 class MainFrame(tk.Frame):
@@ -28,7 +81,7 @@ class MainFrame(tk.Frame):
     buttons.
     """
 
-    def __init__(self, parent, image_file, habit_list, main_canvas_frame):
+    def __init__(self, parent, image_file, habit_list, main_canvas_frame, active_streak_list, streak_index):
         """
         MainFrame constructor.
 
@@ -38,6 +91,9 @@ class MainFrame(tk.Frame):
         habit_list: (type list[dict]) A list of dictionaries containing habit information.
         main_canvas_frame: (type tk.Frame) The instance of the ScrollingCanvasFrame
         on the root window.
+        active_streak_list: (type list[dt.datetime]) A list of all days the user
+        was active in their current streak.
+        streak_index: (type dict) The index of the activity archive.
         """
 
         tk.Frame.__init__(self, parent)
@@ -46,6 +102,10 @@ class MainFrame(tk.Frame):
         self.parent = parent
         self.habit_list = habit_list
         self.main_canvas_frame = main_canvas_frame
+        self.active_streak_list = active_streak_list
+        self.streak_index = streak_index
+        self.edit_window = None
+        self.history_window = None
 
         # Create widgets
         self.plant_image = tk.PhotoImage(file=image_file)
@@ -56,20 +116,51 @@ class MainFrame(tk.Frame):
                                            text="Manage Habits",
                                            command=self.open_edit_window,
                                            font=(DEFAULT_FONT, 10))
+        self.btn_history = tk.Button(self,
+                                     text="History",
+                                     command=self.open_history_window,
+                                     font=(DEFAULT_FONT, 10))
 
         # Add widgets to grid
         self.lbl_plant_image.grid(column=1, row=1, padx=10)
         self.btn_manage_habits.grid(column=1, row=2)
+        self.btn_history.grid(column=1, row=3, pady=(5, 0))
 
-    def open_edit_window(self):
+        # Update the open history window whenever a habit is checked
+        self.winfo_toplevel().bind("<<HabitChecked>>", self.update_history_window, add="+")
+
+    def open_history_window(self):
         """
-        Creates a new Toplevel window for habit editing.
+        Creates a new Toplevel window showing the history of active days.
         """
 
-        edit_window = EditWindow(
+        self.history_window = HistoryWindow(
             parent=self.parent,
-            habit_list=self.habit_list,
-            main_canvas_frame=self.main_canvas_frame)
+            active_streak_list=self.active_streak_list,
+            streak_index=self.streak_index)
+
+    def update_history_window(self, event):
+        """
+        Re-renders the current month of the history window if it is open.
+
+        event: (type tk.Event) The <<HabitChecked>> event.
+        """
+
+        if self.history_window and self.history_window.winfo_exists():
+            self.history_window.update_current_month()
+
+    def open_edit_window(self):
+        """
+        Shows the Toplevel window for habit editing, creating it the first time.
+        """
+
+        if self.edit_window and self.edit_window.winfo_exists():
+            self.edit_window.show()
+        else:
+            self.edit_window = EditWindow(
+                parent=self.parent,
+                habit_list=self.habit_list,
+                main_canvas_frame=self.main_canvas_frame)
 
 
 class ScrollingCanvasFrame(tk.Frame):
@@ -79,8 +170,9 @@ class ScrollingCanvasFrame(tk.Frame):
 
     CANVAS_WIDTH = 275  # Width of the canvas object
     CANVAS_HEIGHT = 200  # Height of the canvas object
+    ROW_TIME_SLICE = 0.015  # Seconds spent building rows before control returns to the event loop
 
-    def __init__(self, parent, habit_list, main_canvas_frame, current_date=None, active_streak_list=None, habit_type="main"):
+    def __init__(self, parent, habit_list, main_canvas_frame, current_date=None, active_streak_list=None, habit_type="main", value_columns=None):
         """
         ScrollingCanvasFrame constructor.
 
@@ -93,6 +185,8 @@ class ScrollingCanvasFrame(tk.Frame):
         was active in their current streak.
         habit_type: (type str) The type of habit frame to display on the canvas:
         "main" for HabitFrame, "edit" for EditFrame.
+        value_columns: (type dict[str, HabitValueColumn]) The values of every
+        quantitative habit by habit id.
         """
 
         tk.Frame.__init__(self, parent)
@@ -104,6 +198,9 @@ class ScrollingCanvasFrame(tk.Frame):
         self.current_date = current_date
         self.active_streak_list = active_streak_list
         self.habit_type = habit_type
+        self.value_columns = value_columns
+        self.expanded_groups = set()  # Names of the groups expanded by the user
+        self.recurrence_index = None  # Habits due today, built when the main list is first shown
 
         # Create widgets
         self.habit_canvas = tk.Canvas(
@@ -111,22 +208,9 @@ class ScrollingCanvasFrame(tk.Frame):
             height=self.CANVAS_HEIGHT,
             width=self.CANVAS_WIDTH)
         self.habit_scroll = tk.Scrollbar(self, orient=tk.VERTICAL)
-        self.habit_list_frame = HabitListFrame(
-            parent=self.habit_canvas,
-            habit_list=self.habit_list,
-            main_canvas_frame=self.main_canvas_frame,
-            edit_canvas_frame=self,
-            habit_type=self.habit_type,
-            active_streak_list=active_streak_list,
-            current_date=self.current_date)
-        self.habit_canvas.create_window((0, 0),
-                                        window=self.habit_list_frame,
-                                        width=self.CANVAS_WIDTH,
-                                        anchor="nw")
 
-        # Configure habit_canvas scrollregion
-        self.parent.update()
-        self.habit_canvas.configure(scrollregion=self.habit_canvas.bbox("all"))
+        self.populate_id = None
+        self.habit_list_frame = self.build_habit_list_frame()
 
         # Add widgets to grid
         self.habit_canvas.grid(column=0, row=0, padx=10)
@@ -136,32 +220,131 @@ class ScrollingCanvasFrame(tk.Frame):
         self.habit_scroll.configure(command=self.habit_canvas.yview)
         self.habit_canvas.configure(yscrollcommand=self.habit_scroll.set)
 
+    def build_habit_list_frame(self):
+        """
+        Creates an empty HabitListFrame on the habit_canvas and schedules its
+        rows to be populated once the window is drawn.
+
+        return type: HabitListFrame
+        """
+
+        with profile_span("ScrollingCanvasFrame.build", {"habit_type": self.habit_type}):
+            habit_list_frame = HabitListFrame(
+                parent=self.habit_canvas,
+                habit_list=self.habit_list,
+                main_canvas_frame=self.main_canvas_frame,
+                edit_canvas_frame=self,
+                habit_type=self.habit_type,
+                active_streak_list=self.active_streak_list,
+                current_date=self.current_date,
+                value_columns=self.value_columns,
+                canvas_frame=self)
+            self.habit_canvas.create_window((0, 0),
+                                            window=habit_list_frame,
+                                            width=self.CANVAS_WIDTH,
+                                            anchor="nw")
+
+        self.schedule_population()
+
+        return habit_list_frame
+
+    def get_recurrence_index(self):
+        """
+        Returns the RecurrenceIndex of the habits due today, updated for the habits
+        changed since it was last used.
+        return type: RecurrenceIndex
+        """
+
+        if self.recurrence_index is None:
+            self.recurrence_index = RecurrenceIndex(self.habit_list, self.current_date, self.current_date)
+        else:
+            self.recurrence_index.update(self.habit_list)
+
+        return self.recurrence_index
+
+    def schedule_population(self):
+        """
+        Schedules the pending rows of the habit_list_frame to be built, unless
+        they are already being built.
+        """
+
+        if self.populate_id is None:
+            self.populate_id = self.after(1, self.populate_rows)
+
+    def populate_rows(self):
+        """
+        Builds the next chunk of rows of the habit_list_frame, rescheduling
+        itself until every row is shown so the window stays responsive while
+        loading.
+        """
+
+        with profile_span("ScrollingCanvasFrame.populate", {"habit_type": self.habit_type}):
+            rows_remaining = self.habit_list_frame.build_rows(self.ROW_TIME_SLICE)
+            self.update_scrollregion()
+
+        if rows_remaining:
+            self.populate_id = self.after(1, self.populate_rows)
+        else:
+            self.populate_id = None
+            self.record_widget_counts()
+
+    def update_scrollregion(self):
+        """
+        Configures the habit_canvas scrollregion to fit the shown rows.
+        """
+
+        self.habit_list_frame.update_idletasks()
+        self.habit_canvas.configure(scrollregion=self.habit_canvas.bbox("all"))
+
     def refresh(self):
         """
         Refreshes the contents of the habit_canvas, showing all current habits.
         """
 
-        self.habit_canvas.delete("all")
+        with profile_span("ScrollingCanvasFrame.refresh", {"habit_type": self.habit_type}):
+            # Stop populating the rows of the old habit_list_frame
+            if self.populate_id:
+                self.after_cancel(self.populate_id)
+                self.populate_id = None
 
-        # Re-create habit_list_frame with updated habits
-        self.habit_list_frame = HabitListFrame(
-            parent=self.habit_canvas,
-            habit_list=self.habit_list,
-            main_canvas_frame=self.main_canvas_frame,
-            edit_canvas_frame=self,
-            habit_type=self.habit_type,
-            active_streak_list=self.active_streak_list,
-            current_date=self.current_date)
-        self.habit_canvas.create_window((0, 0),
-                                        window=self.habit_list_frame,
-                                        width=self.CANVAS_WIDTH,
-                                        anchor="nw")
+            self.habit_canvas.delete("all")
+            self.habit_list_frame.destroy()
 
-        # Re-configure habit_canvas scrollregion
-        self.parent.update()
-        self.habit_canvas.configure(scrollregion=self.habit_canvas.bbox("all"))
+            # Re-create habit_list_frame with updated habits
+            self.habit_list_frame = self.build_habit_list_frame()
+
+            self.habit_canvas.grid(column=0, row=0)
+
+    def record_widget_counts(self):
+        """
+        Records the number of rows and widgets on the habit_canvas while profiling
+        is enabled.
+        """
+
+        if profile_events is None:
+            return
+
+        record_profile_counter(f"{self.habit_type} widgets", {
+            "rows": len(self.habit_list_frame.habit_frame_list),
+            "widgets": count_widgets(self.habit_list_frame)
+        })
+
+    def refresh_habits(self, habit_ids):
+        """
+        Refreshes only the rows of the habit_canvas showing the specified habits.
+
+        habit_ids: (type set[str]) The ids of the habits whose rows should be refreshed.
+        """
 
-        self.habit_canvas.grid(column=0, row=0)
+        for habit_frame in self.habit_list_frame.habit_frame_list:
+            if habit_frame.habit["id"] in habit_ids:
+                habit_frame.update_habit()
+
+        # Update the done counts of the groups, including collapsed groups without rows
+        for group_frame in self.habit_list_frame.group_frames.values():
+            for habit in group_frame.habits:
+                if habit["id"] in habit_ids:
+                    group_frame.update_count(habit)
 
 
 class HabitListFrame(ScrollingCanvasFrame):
@@ -169,7 +352,7 @@ class HabitListFrame(ScrollingCanvasFrame):
     A frame on a canvas containing a list of all habits.
     """
 
-    def __init__(self, parent, habit_list, active_streak_list=None, current_date=None, main_canvas_frame=None, edit_canvas_frame=None, habit_type="main"):
+    def __init__(self, parent, habit_list, active_streak_list=None, current_date=None, main_canvas_frame=None, edit_canvas_frame=None, habit_type="main", value_columns=None, canvas_frame=None):
         """
         HabitListFrame constructor.
 
@@ -184,31 +367,223 @@ class HabitListFrame(ScrollingCanvasFrame):
         current_date: (type dt.datetime) The current date as a dt.datetime object.
         active_streak_list: (type list[dt.datetime]) A list of all days the user
         was active in their current streak.
+        value_columns: (type dict[str, HabitValueColumn]) The values of every
+        quantitative habit by habit id.
+        canvas_frame: (type ScrollingCanvasFrame) The ScrollingCanvasFrame
+        showing this frame.
         """
 
         tk.Frame.__init__(self, parent, width=super().CANVAS_WIDTH)
 
+        # Initialize attributes
+        self.habit_list = habit_list
+        self.active_streak_list = active_streak_list
+        self.current_date = current_date
+        self.main_canvas_frame = main_canvas_frame
+        self.edit_canvas_frame = edit_canvas_frame
+        self.habit_type = habit_type
+        self.value_columns = value_columns
+        self.canvas_frame = canvas_frame
         self.habit_frame_list = []
+        self.group_frames = {}  # The section of every group: {name: HabitGroupFrame}
+        self.pending_rows = []  # Rows waiting to be built, the next row last
 
-        # Append a habit_frame to habit_frame_list for every habit in habit_list
-        for habit in habit_list:
-            if habit_type == "main":
-                if current_date.strftime("%a") in habit["weekdays"]:
-                    self.habit_frame_list.append(HabitFrame(parent=self,
-                                                            habit=habit,
-                                                            current_date=current_date,
-                                                            active_streak_list=active_streak_list))
-            elif habit_type == "edit":
-                self.habit_frame_list.append(EditFrame(
+        # Only show the habits due today on the main window
+        if habit_type == "main":
+            shown_habits = canvas_frame.get_recurrence_index().get_due_habits(current_date)
+        else:
+            shown_habits = habit_list
+
+        # Sort the habits into sections, in the order each group first appears.
+        # Ungrouped habits share a section without a header
+        for habit in shown_habits:
+            group = habit.get("group", "")
+            if group not in self.group_frames:
+                self.group_frames[group] = HabitGroupFrame(
                     parent=self,
-                    habit_list=habit_list,
+                    name=group,
+                    habit_list_frame=self,
+                    expanded=not group or group in canvas_frame.expanded_groups)
+                self.group_frames[group].grid(column=0, row=len(self.group_frames) - 1, sticky="w")
+            self.group_frames[group].habits.append(habit)
+
+        # Only the rows of expanded sections are built
+        for group_frame in self.group_frames.values():
+            group_frame.update_count()
+        self.queue_rows([group_frame for group_frame in self.group_frames.values() if group_frame.expanded])
+
+    def queue_rows(self, group_frames):
+        """
+        Adds the rows of sections to the rows built next by build_rows,
+        highlighted habits first on the main window.
+
+        group_frames: (type list[HabitGroupFrame]) The sections whose rows should be built.
+        """
+
+        rows = []
+        for group_frame in group_frames:
+            group_frame.queued = True
+            for row, habit in enumerate(group_frame.habits):
+                rows.append((group_frame, row, habit))
+
+        if self.habit_type == "main":
+            rows.sort(key=lambda row: not row[2]["highlight"])
+
+        # The list is reversed so the next row is popped off the end
+        self.pending_rows.extend(reversed(rows))
+
+    def build_rows(self, time_slice):
+        """
+        Appends a habit_frame to habit_frame_list for pending habits until
+        time_slice seconds have passed. Every row is placed at its final
+        position in the list, regardless of the order it is built in.
+
+        time_slice: (type float) The number of seconds to spend building rows.
+
+        return type: bool (True if rows remain to be built)
+        """
+
+        deadline = time.perf_counter() + time_slice
+
+        while self.pending_rows and time.perf_counter() < deadline:
+            group_frame, row, habit = self.pending_rows.pop()
+
+            if self.habit_type == "main":
+                habit_frame = HabitFrame(parent=group_frame.frm_rows,
+                                         habit=habit,
+                                         current_date=self.current_date,
+                                         active_streak_list=self.active_streak_list,
+                                         value_columns=self.value_columns)
+                habit_frame.bind("<<HabitChecked>>", group_frame.habit_checked, add="+")
+            else:
+                habit_frame = EditFrame(
+                    parent=group_frame.frm_rows,
+                    habit_list=self.habit_list,
                     habit=habit,
-                    main_canvas_frame=main_canvas_frame,
-                    edit_canvas_frame=edit_canvas_frame))
+                    main_canvas_frame=self.main_canvas_frame,
+                    edit_canvas_frame=self.edit_canvas_frame)
+
+            # Add widgets to grid
+            habit_frame.grid(column=0, row=row, pady=1)
+            self.habit_frame_list.append(habit_frame)
+
+        return bool(self.pending_rows)
+
+
+class HabitGroupFrame(HabitListFrame):
+    """
+    A collapsible section of the habit list containing the habits of one group.
+    The rows of a section are only built once it is expanded.
+    """
+
+    def __init__(self, parent, name, habit_list_frame, expanded):
+        """
+        HabitGroupFrame constructor.
+
+        parent: (type tk.Frame) The parent frame of this frame.
+        name: (type str) The name of the group, "" for ungrouped habits.
+        habit_list_frame: (type HabitListFrame) The HabitListFrame containing
+        this section.
+        expanded: (type bool) Whether the rows of the section are shown.
+        """
+
+        tk.Frame.__init__(self, parent, width=super().CANVAS_WIDTH)
+
+        # Initialize attributes
+        self.name = name
+        self.habit_list_frame = habit_list_frame
+        self.expanded = expanded
+        self.queued = False  # Whether the rows have been queued to be built
+        self.habits = []
+        self.done_ids = set()  # Ids of the habits of the group checked today
+
+        # Create widgets
+        self.frm_rows = tk.Frame(self)
+        if name:
+            self.frm_header = tk.Frame(self)
+            self.btn_toggle = tk.Button(self.frm_header,
+                                        command=self.toggle,
+                                        font=(DEFAULT_FONT, 7))
+            self.lbl_group_name = tk.Label(self.frm_header,
+                                           text=name,
+                                           font=(DEFAULT_FONT, 10, "bold"))
+            self.lbl_count = tk.Label(self.frm_header,
+                                      font=(DEFAULT_FONT, 8))
+
+            # Add widgets to grid
+            self.btn_toggle.grid(column=0, row=0)
+            self.lbl_group_name.grid(column=1, row=0, padx=(4, 0), sticky="w")
+            self.lbl_count.grid(column=2, row=0, padx=(4, 0), sticky="w")
+            self.frm_header.grid(column=0, row=0, pady=(2, 0), sticky="w")
 
         # Add widgets to grid
-        for i in range(len(self.habit_frame_list)):
-            self.habit_frame_list[i].grid(column=0, row=i, pady=1)
+        self.frm_rows.grid(column=0, row=1, sticky="w")
+        self.show_rows()
+
+    def show_rows(self):
+        """
+        Shows or hides the rows of the section, depending on whether it is expanded.
+        """
+
+        if self.expanded:
+            self.frm_rows.grid()
+        else:
+            self.frm_rows.grid_remove()
+
+        if self.name:
+            self.btn_toggle.config(text="▾" if self.expanded else "▸")
+
+    def toggle(self):
+        """
+        Expands or collapses the section, queueing its rows to be built the first
+        time it is expanded.
+        """
+
+        canvas_frame = self.habit_list_frame.canvas_frame
+        self.expanded = not self.expanded
+
+        if self.expanded:
+            canvas_frame.expanded_groups.add(self.name)
+            if not self.queued:
+                self.habit_list_frame.queue_rows([self])
+                canvas_frame.schedule_population()
+        else:
+            canvas_frame.expanded_groups.discard(self.name)
+
+        self.show_rows()
+        canvas_frame.update_scrollregion()
+
+    def update_count(self, habit=None):
+        """
+        Updates the number of habits of the group checked today. Only the given
+        habit is counted again, or every habit if none is given.
+
+        habit: (type dict) A dictionary containing an individual habit's information.
+        """
+
+        for counted_habit in [habit] if habit else self.habits:
+            if counted_habit["checked"]:
+                self.done_ids.add(counted_habit["id"])
+            else:
+                self.done_ids.discard(counted_habit["id"])
+
+        if not self.name:
+            return
+
+        # The editing window shows the size of each group instead
+        if self.habit_list_frame.habit_type == "main":
+            self.lbl_count.config(text=f"{len(self.done_ids)}/{len(self.habits)}")
+        else:
+            self.lbl_count.config(text=f"({len(self.habits)})")
+
+    def habit_checked(self, event):
+        """
+        Updates the count of the group when one of its habits is checked.
+
+        event: (type tk.Event) The <<HabitChecked>> event of the habit's row.
+        """
+
+        self.update_count(event.widget.habit)
 
 
 class HabitFrame(HabitListFrame):
@@ -216,7 +591,11 @@ class HabitFrame(HabitListFrame):
     A frame containing an individual habit's information.
     """
 
-    def __init__(self, parent, habit, current_date, active_streak_list):
+    PROGRESS_BAR_WIDTH = 80  # Width of the progress bar of a quantitative habit
+    PROGRESS_BAR_HEIGHT = 6  # Height of the progress bar of a quantitative habit
+    PROGRESS_COLOR = "#40c463"  # Fill color of the progress bar
+
+    def __init__(self, parent, habit, current_date, active_streak_list, value_columns=None):
         """
         HabitFrame constructor.
 
@@ -225,6 +604,8 @@ class HabitFrame(HabitListFrame):
         current_date: (type dt.datetime) The current date as a dt.datetime object.
         active_streak_list: (type list[dt.datetime]) A list of all days the user
         was active in their current streak.
+        value_columns: (type dict[str, HabitValueColumn]) The values of every
+        quantitative habit by habit id.
         """
 
         tk.Frame.__init__(self, parent, width=super().CANVAS_WIDTH, bg=NORMAL_BACKGROUND_COLOR)
@@ -233,52 +614,139 @@ class HabitFrame(HabitListFrame):
         self.habit = habit
         self.current_date = current_date
         self.active_streak_list = active_streak_list
+        self.value_columns = value_columns if value_columns is not None else {}
+        self.quantitative = is_quantitative_habit(habit)
 
         # Create widgets
         self.frm_labels = tk.Frame(self, bg=NORMAL_BACKGROUND_COLOR)
         self.lbl_habit_name = tk.Label(self.frm_labels,
-                                       text=habit["name"],
                                        bg=NORMAL_TEXT_COLOR,
                                        font=(DEFAULT_FONT, 10))
         self.lbl_note = tk.Label(self.frm_labels,
-                                 text=habit["note"],
                                  bg=NORMAL_TEXT_COLOR,
                                  font=(DEFAULT_FONT, 8))
         self.lbl_habit_name.grid(column=0, row=0, sticky="w")
         self.lbl_note.grid(column=0, row=1, sticky="w")
         self.frm_checkbox = tk.Frame(self)
-        self.complete_checked = tk.BooleanVar()
-        self.check_completed = tk.Checkbutton(self.frm_checkbox,
-                                              variable=self.complete_checked,
-                                              command=self.habit_checked)
 
-        # Mark habit as checked if it has been completed today
-        if habit["checked"]:
-            self.check_completed.select()
+        # Quantitative habits get buttons and a progress bar instead of a checkbox
+        if self.quantitative:
+            self.frm_progress = tk.Frame(self.frm_labels, bg=NORMAL_BACKGROUND_COLOR)
+            self.cnv_progress = tk.Canvas(self.frm_progress,
+                                          width=self.PROGRESS_BAR_WIDTH,
+                                          height=self.PROGRESS_BAR_HEIGHT,
+                                          bg=NORMAL_TEXT_COLOR,
+                                          highlightthickness=1)
+            self.lbl_progress = tk.Label(self.frm_progress,
+                                         bg=NORMAL_TEXT_COLOR,
+                                         font=(DEFAULT_FONT, 8))
+            self.btn_decrease = tk.Button(self.frm_checkbox,
+                                          text="-",
+                                          command=lambda: self.habit_value_changed(-1),
+                                          font=(DEFAULT_FONT, 7))
+            self.btn_increase = tk.Button(self.frm_checkbox,
+                                          text="+",
+                                          command=lambda: self.habit_value_changed(1),
+                                          font=(DEFAULT_FONT, 7))
+            self.cnv_progress.grid(column=0, row=0, sticky="w")
+            self.lbl_progress.grid(column=1, row=0, padx=(4, 0), sticky="w")
+            self.frm_progress.grid(column=0, row=2, sticky="w")
+            self.btn_decrease.pack(side=tk.LEFT)
+            self.btn_increase.pack(side=tk.LEFT)
+            control_width = 45
+        else:
+            self.complete_checked = tk.BooleanVar()
+            self.check_completed = tk.Checkbutton(self.frm_checkbox,
+                                                  variable=self.complete_checked,
+                                                  command=self.habit_checked)
+            self.check_completed.pack(fill=tk.X)
+            control_width = 20
 
-        # Make widget backgrounds yellow if habit is highlighted
-        if habit["highlight"]:
-            self.config(bg=HIGHLIGHT_BACKGROUND_COLOR)
-            self.frm_labels.config(bg=HIGHLIGHT_BACKGROUND_COLOR)
-            self.lbl_habit_name.config(bg=HIGHLIGHT_TEXT_COLOR)
-            self.lbl_note.config(bg=HIGHLIGHT_TEXT_COLOR)
+        # Fill in the habit's information
+        self.update_habit()
 
         # Add widgets to grid
-        self.check_completed.pack(fill=tk.X)
-        self.columnconfigure(0, minsize=(super().CANVAS_WIDTH) - 20)
+        self.columnconfigure(0, minsize=(super().CANVAS_WIDTH) - control_width)
         self.frm_labels.grid(column=0, row=0, sticky="w")
         self.frm_checkbox.grid(column=1, row=0, sticky="e")
 
+    def update_habit(self):
+        """
+        Updates the widgets of this frame to show the current habit information.
+        """
+
+        self.lbl_habit_name.config(text=self.habit["name"])
+        self.lbl_note.config(text=self.habit["note"])
+
+        # Show the progress towards the target, or mark habit as checked if it
+        # has been completed today
+        if self.quantitative:
+            self.update_progress()
+        elif self.habit["checked"]:
+            self.check_completed.select()
+        else:
+            self.check_completed.deselect()
+
+        # Make widget backgrounds yellow if habit is highlighted
+        if self.habit["highlight"]:
+            background_color = HIGHLIGHT_BACKGROUND_COLOR
+            text_color = HIGHLIGHT_TEXT_COLOR
+        else:
+            background_color = NORMAL_BACKGROUND_COLOR
+            text_color = NORMAL_TEXT_COLOR
+
+        self.config(bg=background_color)
+        self.frm_labels.config(bg=background_color)
+        self.lbl_habit_name.config(bg=text_color)
+        self.lbl_note.config(bg=text_color)
+        if self.quantitative:
+            self.frm_progress.config(bg=background_color)
+            self.lbl_progress.config(bg=text_color)
+
+    def update_progress(self):
+        """
+        Shows today's value of a quantitative habit against its target, with the
+        average of the last 7 days.
+        """
+
+        column = self.value_columns.get(self.habit["id"])
+        stats = column.get_stats() if column else {"value": 0, "averages": {7: 0.0}}
+        target = max(1, self.habit["target"])
+        unit = " min" if self.habit["kind"] == "duration" else ""
+
+        self.lbl_progress.config(text=f"{stats['value']}/{target}{unit}  7d avg {stats['averages'][7]:.1f}")
+
+        # Fill the bar up to the target
+        self.cnv_progress.delete("all")
+        fill_width = self.PROGRESS_BAR_WIDTH * min(stats["value"], target) // target
+        if fill_width:
+            self.cnv_progress.create_rectangle(0, 0, fill_width, self.PROGRESS_BAR_HEIGHT + 2,
+                                               fill=self.PROGRESS_COLOR,
+                                               width=0)
+
     def habit_checked(self):
         """
         Adds current_date to the active_streak_list, extending the streak.
         Sets the current date as the date last checked in the habit dictionary.
         """
 
-        if self.active_streak_list[-1].strftime("%Y-%m-%d") != self.current_date.strftime("%Y-%m-%d"):
-            self.active_streak_list.append(self.current_date)
+        check_habit(self.habit, self.complete_checked.get(), self.active_streak_list, self.current_date)
+        self.event_generate("<<HabitChecked>>")
+
+    def habit_value_changed(self, steps):
+        """
+        Adds to or removes from today's value of a quantitative habit, checking
+        the habit once the target is reached.
+
+        steps: (type int) The number of steps to add, negative to remove. A step
+        is 1 for count habits and DURATION_STEP minutes for duration habits.
+        """
+
+        step = DURATION_STEP if self.habit["kind"] == "duration" else 1
 
-        self.habit["checked"] = self.complete_checked.get()
+        record_habit_value(self.habit, steps * step, self.value_columns, self.active_streak_list, self.current_date)
+        self.update_progress()
+        self.event_generate("<<HabitChecked>>")
 
 
 class EditFrame(HabitListFrame):
@@ -340,18 +808,28 @@ class EditFrame(HabitListFrame):
         self.btn_delete.grid(column=2, row=0, sticky="e")
         self.change_index_frame.grid(column=3, row=0)
 
+    def update_habit(self):
+        """
+        Updates the widgets of this frame to show the current habit information.
+        """
+
+        self.lbl_habit_name.config(text=self.habit["name"])
+
     def change_index(self, modifier):
         """
-        Changes the index of the current habit.
+        Changes the index of the current habit within its group.
         
-        modifier: (type int) The amount of indices a habit should be moved in the list.
+        modifier: (type int) The amount of indices a habit should be moved in the group.
         """
 
+        group = self.habit.get("group", "")
+        group_indices = [index for index, habit in enumerate(self.habit_list) if habit.get("group", "") == group]
         old_index = self.habit_list.index(self.habit)
-        new_index = old_index + modifier
+        group_position = group_indices.index(old_index)
 
         # Switches the habits in old_index and new_index, if possible
-        if new_index >= 0 and new_index < len(self.habit_list):
+        if 0 <= group_position + modifier < len(group_indices):
+            new_index = group_indices[group_position + modifier]
             self.habit_list[old_index] = self.habit_list[new_index]
             self.habit_list[new_index] = self.habit
             self.main_canvas_frame.refresh()
@@ -359,15 +837,10 @@ class EditFrame(HabitListFrame):
 
     def open_habit_window(self):
         """
-        Creates a new Toplevel window for habit information to be changed.
+        Shows the Toplevel window for habit information to be changed.
         """
 
-        habit_window = HabitWindow(
-            parent=self.parent,
-            habit_list=self.habit_list,
-            main_canvas_frame=self.main_canvas_frame,
-            habit=self.habit,
-            edit_canvas_frame=self.edit_canvas_frame)
+        self.edit_canvas_frame.winfo_toplevel().open_habit_window(self.habit)
 
     def delete_prompt(self):
         """
@@ -394,7 +867,7 @@ class MainWindow(tk.Frame):
     ScrollingCanvasFrame.
     """
 
-    def __init__(self, parent, image_file, habit_list, current_date, active_streak_list):
+    def __init__(self, parent, image_file, habit_list, current_date, active_streak_list, streak_index, habit_snapshot, file_signatures, value_columns):
         """
         MainWindow constructor.
 
@@ -405,25 +878,102 @@ class MainWindow(tk.Frame):
         current_date: (type dt.datetime) The current date as a dt.datetime object.
         active_streak_list: (type list[dt.datetime]) A list of all days the user
         was active in their current streak.
+        streak_index: (type dict) The index of the activity archive.
+        habit_snapshot: (type list[dict]) The habit list as it was last read from
+        the habit file.
+        file_signatures: (type tuple) The signatures of the data files when they
+        were last read.
+        value_columns: (type dict[str, HabitValueColumn]) The values of every
+        quantitative habit by habit id.
         """
 
         tk.Frame.__init__(self, parent)
 
+        # Initialize attributes
+        self.habit_list = habit_list
+        self.current_date = current_date
+        self.active_streak_list = active_streak_list
+        self.habit_snapshot = habit_snapshot
+        self.file_signatures = file_signatures
+        self.value_columns = value_columns
+
         # Create content frames
         self.canvas_frame = ScrollingCanvasFrame(parent=self,
                                                  habit_list=habit_list,
                                                  main_canvas_frame=self,
                                                  current_date=current_date,
-                                                 active_streak_list=active_streak_list)
+                                                 active_streak_list=active_streak_list,
+                                                 value_columns=value_columns)
         self.main_frame = MainFrame(parent=self,
                                     image_file=image_file,
                                     habit_list=habit_list,
-                                    main_canvas_frame=self.canvas_frame)
+                                    main_canvas_frame=self.canvas_frame,
+                                    active_streak_list=active_streak_list,
+                                    streak_index=streak_index)
 
         # Add frames to grid
         self.main_frame.grid(column=0, row=0)
         self.canvas_frame.grid(column=0, row=1)
 
+        # Start watching the data files for changes made by other instances
+        self.after(FILE_CHECK_INTERVAL, self.watch_data_files)
+
+    def watch_data_files(self):
+        """
+        Reloads the data files if they have been changed by another instance of
+        the program since they were last read.
+        """
+
+        if get_data_file_signatures() != self.file_signatures:
+            self.reload_data_files()
+
+        self.after(FILE_CHECK_INTERVAL, self.watch_data_files)
+
+    def reload_data_files(self):
+        """
+        Merges changes made to the data files by another instance of the program
+        into habit_list, active_streak_list and value_columns, refreshing only the
+        affected rows. Does nothing while another instance holds the lock, so the
+        window never freezes; watch_data_files tries again on its next check.
+        """
+
+        # Read the data files while no other instance is writing them
+        try:
+            with lock_data_files(LOCK_FILE_NAME, blocking=False):
+                self.file_signatures = get_data_file_signatures()
+                disk_habit_list = read_habit_file(HABIT_FILE_NAME)
+                disk_streak_list = read_streak_file(STREAK_FILE_NAME, self.current_date)
+                disk_value_columns = read_value_file(VALUE_FILE_NAME, self.current_date)
+        except BlockingIOError:
+            return
+
+        merge_streak_lists(disk_streak_list, self.active_streak_list)
+        changed_value_ids = merge_value_columns(disk_value_columns, self.value_columns)
+
+        # Keep the current habits if the habit file has been removed
+        if self.file_signatures[0] is None:
+            changed_habit_ids, structure_changed = set(), False
+        else:
+            changed_habit_ids, structure_changed = merge_habit_lists(
+                self.habit_snapshot,
+                disk_habit_list,
+                self.habit_list)
+            self.habit_snapshot = disk_habit_list
+
+        changed_habit_ids |= changed_value_ids
+
+        # Refresh the canvases of the main window and the editing window
+        canvas_frames = [self.canvas_frame]
+        edit_window = self.main_frame.edit_window
+        if edit_window and edit_window.winfo_exists():
+            canvas_frames.append(edit_window.edit_canvas_frame)
+
+        for canvas_frame in canvas_frames:
+            if structure_changed:
+                canvas_frame.refresh()
+            elif changed_habit_ids:
+                canvas_frame.refresh_habits(changed_habit_ids)
+
 
 class CreateHabitFrame(tk.Frame):
     """
@@ -432,6 +982,27 @@ class CreateHabitFrame(tk.Frame):
 
     NAME_CHARACTER_LIMIT = 22 # Character limit of the habit name
     NOTE_CHARACTER_LIMIT = 35 # Character limit of the habit note
+    GROUP_CHARACTER_LIMIT = 15 # Character limit of the group name
+
+    # Recurrence rule types as shown in the menu, and the label of their value entry
+    RECURRENCE_TYPES = {
+        "Weekdays": "weekdays",
+        "Every N days": "interval",
+        "N times a week": "times_per_week",
+        "Days of month": "month_days"
+    }
+    RECURRENCE_VALUE_LABELS = {
+        "interval": "Every N days, N:",
+        "times_per_week": "Times a week:",
+        "month_days": "Days, e.g. 1,15:"
+    }
+
+    # Habit kinds as shown in the menu
+    HABIT_KINDS = {
+        "Checkbox": "check",
+        "Count": "count",
+        "Minutes": "duration"
+    }
 
     def __init__(self, parent, habit_list, main_canvas_frame, edit_canvas_frame, habit=None):
         """
@@ -457,7 +1028,10 @@ class CreateHabitFrame(tk.Frame):
         # Create variables for widgets
         self.name_text = tk.StringVar()
         self.note_text = tk.StringVar()
+        self.group_text = tk.StringVar()
         self.highlight_checked = tk.BooleanVar()
+        self.recurrence_type = tk.StringVar(value="Weekdays")
+        self.habit_kind = tk.StringVar(value="Checkbox")
 
         # Create widgets
         self.lbl_habit_name = tk.Label(self,
@@ -466,9 +1040,36 @@ class CreateHabitFrame(tk.Frame):
         self.lbl_note = tk.Label(self,
                                  text="Note: ",
                                  font=(DEFAULT_FONT, 10))
+        self.lbl_group = tk.Label(self,
+                                  text="Group: ",
+                                  font=(DEFAULT_FONT, 10))
         self.lbl_repeat = tk.Label(self,
-                                   text="Repeat on:",
+                                   text="Repeat:",
                                    font=(DEFAULT_FONT, 10))
+        self.opt_recurrence_type = tk.OptionMenu(self,
+                                                 self.recurrence_type,
+                                                 *self.RECURRENCE_TYPES,
+                                                 command=lambda *args: self.show_recurrence_widgets())
+        self.opt_recurrence_type.config(font=(DEFAULT_FONT, 10))
+        self.frm_recurrence_value = tk.Frame(self)
+        self.lbl_recurrence_value = tk.Label(self.frm_recurrence_value,
+                                             font=(DEFAULT_FONT, 10))
+        self.ent_recurrence_value = tk.Entry(self.frm_recurrence_value,
+                                             width=10,
+                                             font=(DEFAULT_FONT, 10))
+        self.frm_date_range = tk.Frame(self)
+        self.lbl_start = tk.Label(self.frm_date_range,
+                                  text="From:",
+                                  font=(DEFAULT_FONT, 10))
+        self.ent_start = tk.Entry(self.frm_date_range,
+                                  width=10,
+                                  font=(DEFAULT_FONT, 10))
+        self.lbl_end = tk.Label(self.frm_date_range,
+                                text="Until:",
+                                font=(DEFAULT_FONT, 10))
+        self.ent_end = tk.Entry(self.frm_date_range,
+                                width=10,
+                                font=(DEFAULT_FONT, 10))
         self.ent_habit_name = tk.Entry(self,
                                        width=self.NAME_CHARACTER_LIMIT,
                                        textvariable=self.name_text,
@@ -477,6 +1078,25 @@ class CreateHabitFrame(tk.Frame):
                                  width=25,
                                  textvariable=self.note_text,
                                  font=(DEFAULT_FONT, 10))
+        self.ent_group = tk.Entry(self,
+                                  width=self.GROUP_CHARACTER_LIMIT,
+                                  textvariable=self.group_text,
+                                  font=(DEFAULT_FONT, 10))
+        self.frm_kind = tk.Frame(self)
+        self.lbl_kind = tk.Label(self.frm_kind,
+                                 text="Track:",
+                                 font=(DEFAULT_FONT, 10))
+        self.opt_kind = tk.OptionMenu(self.frm_kind,
+                                      self.habit_kind,
+                                      *self.HABIT_KINDS,
+                                      command=lambda *args: self.show_target_widgets())
+        self.opt_kind.config(font=(DEFAULT_FONT, 10))
+        self.lbl_target = tk.Label(self.frm_kind,
+                                   text="Target:",
+                                   font=(DEFAULT_FONT, 10))
+        self.ent_target = tk.Entry(self.frm_kind,
+                                   width=5,
+                                   font=(DEFAULT_FONT, 10))
         self.check_highlight = tk.Checkbutton(self,
                                               text="Highlight",
                                               onvalue=True,
@@ -490,25 +1110,38 @@ class CreateHabitFrame(tk.Frame):
                                   font=(DEFAULT_FONT, 10))
         self.weekday_select_frame = WeekdaySelectFrame(self, habit)
 
-        # Fill in pre-existing values if an existing habit is being altered
-        if habit:
-            self.ent_habit_name.insert(index=0, string=habit["name"])
-            self.ent_note.insert(index=0, string=habit["note"])
-            self.highlight_checked.set(habit["highlight"])
-
         # Add widgets to grid
+        self.lbl_recurrence_value.grid(column=0, row=0, sticky="w")
+        self.ent_recurrence_value.grid(column=1, row=0, sticky="w")
+        self.lbl_start.grid(column=0, row=0, sticky="w")
+        self.ent_start.grid(column=1, row=0, sticky="w")
+        self.lbl_end.grid(column=2, row=0, sticky="w")
+        self.ent_end.grid(column=3, row=0, sticky="w")
+        self.lbl_kind.grid(column=0, row=0, sticky="w")
+        self.opt_kind.grid(column=1, row=0, sticky="w")
+        self.lbl_target.grid(column=2, row=0, padx=(5, 0), sticky="w")
+        self.ent_target.grid(column=3, row=0, sticky="w")
         self.lbl_habit_name.grid(column=0, row=0, sticky="w")
         self.ent_habit_name.grid(column=1, row=0, columnspan=2, sticky="w")
         self.lbl_note.grid(column=0, row=1, sticky="w")
         self.ent_note.grid(column=1, row=1, columnspan=3, sticky="w")
-        self.lbl_repeat.grid(column=0, row=2, pady=(10, 0), sticky="w")
-        self.weekday_select_frame.grid(column=0, row=3, pady=(0, 10), columnspan=2)
-        self.check_highlight.grid(column=0, row=4, sticky="w")
-        self.btn_done.grid(column=1, row=4, pady=5, sticky="n")
+        self.lbl_group.grid(column=0, row=2, sticky="w")
+        self.ent_group.grid(column=1, row=2, columnspan=2, sticky="w")
+        self.lbl_repeat.grid(column=0, row=3, pady=(10, 0), sticky="w")
+        self.opt_recurrence_type.grid(column=1, row=3, pady=(10, 0), sticky="w")
+        self.weekday_select_frame.grid(column=0, row=4, pady=(0, 10), columnspan=2)
+        self.frm_recurrence_value.grid(column=0, row=4, pady=(0, 10), columnspan=2, sticky="w")
+        self.frm_date_range.grid(column=0, row=5, pady=(0, 10), columnspan=2, sticky="w")
+        self.frm_kind.grid(column=0, row=6, pady=(0, 10), columnspan=2, sticky="w")
+        self.check_highlight.grid(column=0, row=7, sticky="w")
+        self.btn_done.grid(column=1, row=7, pady=5, sticky="n")
+
+        self.bind_habit(habit)
 
         # Configure entry character limits
         self.name_text.trace("w", lambda *args: self.character_limit(self.name_text, self.NAME_CHARACTER_LIMIT))
         self.note_text.trace("w", lambda *args: self.character_limit(self.note_text, self.NOTE_CHARACTER_LIMIT))
+        self.group_text.trace("w", lambda *args: self.character_limit(self.group_text, self.GROUP_CHARACTER_LIMIT))
 
     def character_limit(self, text, limit):
         """
@@ -521,6 +1154,135 @@ class CreateHabitFrame(tk.Frame):
         if len(text.get()) > limit:
             text.set(text.get()[:limit])
 
+    def bind_habit(self, habit=None):
+        """
+        Resets the widgets to show a habit, or empty values for a new habit, so
+        the same frame can be reused for every habit.
+
+        habit: (type dict) A dictionary containing an individual habit's information.
+        """
+
+        self.habit = habit
+
+        # Clear the values of the previous habit
+        for entry in (self.ent_habit_name, self.ent_note, self.ent_group, self.ent_recurrence_value, self.ent_start, self.ent_end, self.ent_target):
+            entry.delete(0, tk.END)
+        self.highlight_checked.set(False)
+        self.recurrence_type.set("Weekdays")
+        self.habit_kind.set("Checkbox")
+        self.weekday_select_frame.bind_habit(habit)
+
+        # Fill in pre-existing values if an existing habit is being altered
+        if habit:
+            self.ent_habit_name.insert(index=0, string=habit["name"])
+            self.ent_note.insert(index=0, string=habit["note"])
+            self.ent_group.insert(index=0, string=habit.get("group", ""))
+            self.highlight_checked.set(habit["highlight"])
+
+            rule = get_recurrence_rule(habit)
+            for label, rule_type in self.RECURRENCE_TYPES.items():
+                if rule_type == rule["type"]:
+                    self.recurrence_type.set(label)
+            if rule["type"] == "interval":
+                self.ent_recurrence_value.insert(index=0, string=str(rule["every"]))
+            elif rule["type"] == "times_per_week":
+                self.ent_recurrence_value.insert(index=0, string=str(rule["times"]))
+            elif rule["type"] == "month_days":
+                self.ent_recurrence_value.insert(index=0, string=",".join(str(day) for day in rule["days"]))
+            if rule.get("start"):
+                self.ent_start.insert(index=0, string=rule["start"])
+            if rule.get("end"):
+                self.ent_end.insert(index=0, string=rule["end"])
+
+            if is_quantitative_habit(habit):
+                for label, kind in self.HABIT_KINDS.items():
+                    if kind == habit["kind"]:
+                        self.habit_kind.set(label)
+                self.ent_target.insert(index=0, string=str(habit["target"]))
+
+        self.show_recurrence_widgets()
+        self.show_target_widgets()
+
+    def show_recurrence_widgets(self):
+        """
+        Shows the weekday checkbuttons or the value entry, depending on the
+        selected recurrence rule type.
+        """
+
+        rule_type = self.RECURRENCE_TYPES[self.recurrence_type.get()]
+
+        if rule_type == "weekdays":
+            self.frm_recurrence_value.grid_remove()
+            self.weekday_select_frame.grid()
+        else:
+            self.weekday_select_frame.grid_remove()
+            self.lbl_recurrence_value.config(text=self.RECURRENCE_VALUE_LABELS[rule_type])
+            self.frm_recurrence_value.grid()
+
+    def show_target_widgets(self):
+        """
+        Shows the target entry if the selected habit kind counts times or minutes.
+        """
+
+        if self.HABIT_KINDS[self.habit_kind.get()] == "check":
+            self.lbl_target.grid_remove()
+            self.ent_target.grid_remove()
+        else:
+            self.lbl_target.config(text="Minutes:" if self.HABIT_KINDS[self.habit_kind.get()] == "duration" else "Target:")
+            self.lbl_target.grid()
+            self.ent_target.grid()
+
+    def get_target(self):
+        """
+        Returns the daily target entered for the habit, 1 for checkbox habits.
+        Raises ValueError if the entered target is invalid.
+        return type: int
+        """
+
+        if self.HABIT_KINDS[self.habit_kind.get()] == "check":
+            return 1
+
+        target = int(self.ent_target.get().strip())
+        if target < 1:
+            raise ValueError("Target must be at least 1")
+
+        return target
+
+    def get_recurrence(self):
+        """
+        Returns the recurrence rule entered for the habit. Raises ValueError if an
+        entered value is invalid.
+        return type: dict
+        """
+
+        rule_type = self.RECURRENCE_TYPES[self.recurrence_type.get()]
+        rule = {"type": rule_type}
+        value = self.ent_recurrence_value.get().strip()
+
+        if rule_type == "weekdays":
+            rule["weekdays"] = self.weekday_select_frame.get_weekdays()
+        elif rule_type == "interval":
+            rule["every"] = int(value)
+        elif rule_type == "times_per_week":
+            rule["times"] = int(value)
+        elif rule_type == "month_days":
+            rule["days"] = sorted({int(day) for day in value.split(",") if day.strip()})
+            if not all(1 <= day <= 31 for day in rule["days"]):
+                raise ValueError("Days of the month must be between 1 and 31")
+
+        if rule_type in ("interval", "times_per_week") and rule.get("every", rule.get("times")) < 1:
+            raise ValueError("N must be at least 1")
+
+        # Check the date range, counting intervals from the start date or today
+        for key, entry in (("start", self.ent_start), ("end", self.ent_end)):
+            if entry.get().strip():
+                rule[key] = dt.datetime.strptime(entry.get().strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+
+        if rule_type == "interval" and "start" not in rule:
+            rule["start"] = dt.datetime.today().strftime("%Y-%m-%d")
+
+        return rule
+
     def habit_done(self):
         """
         Completes habit creation. Stores all entered values in habits, refreshes
@@ -530,33 +1292,49 @@ class CreateHabitFrame(tk.Frame):
         # Get habit attributes from widgets
         name = self.ent_habit_name.get()
         note = self.ent_note.get()
+        group = self.ent_group.get().strip()
         weekdays = self.weekday_select_frame.get_weekdays()
         highlight = self.highlight_checked.get()
 
+        kind = self.HABIT_KINDS[self.habit_kind.get()]
+
+        try:
+            recurrence = self.get_recurrence()
+        except ValueError as error:
+            tk.messagebox.showwarning(title="Invalid repeat", message=str(error), parent=self)
+            return
+
+        try:
+            target = self.get_target()
+        except ValueError as error:
+            tk.messagebox.showwarning(title="Invalid target", message=str(error), parent=self)
+            return
+
         # Insert habit into the correct index of habit_list
-        if self.habit:
+        if self.habit and self.habit in self.habit_list:
             index = self.habit_list.index(self.habit)
             self.habit_list.remove(self.habit)
         else:
             index = len(self.habit_list)
 
-        self.habit_list.insert(
-            index,
-            {
-                "name": name,
-                "note": note,
-                "weekdays": weekdays,
-                "highlight": highlight,
-                "checked": False
-            }
-        )
+        # Keep the id of an existing habit so other instances can match it
+        if self.habit:
+            habit_id = self.habit["id"]
+        else:
+            habit_id = None
+
+        new_habit = make_habit(name, note, weekdays, highlight, recurrence, habit_id, kind, target, group)
+
+        # Keep the completions this week of an existing habit
+        if self.habit and "week_checks" in self.habit:
+            new_habit["week_checks"] = self.habit["week_checks"]
+
+        self.habit_list.insert(index, new_habit)
 
         self.edit_canvas_frame.refresh()
         self.main_canvas_frame.refresh()
 
-        self.edit_canvas_frame.winfo_toplevel().grab_set()
-
-        self.winfo_toplevel().destroy()
+        self.winfo_toplevel().pass_focus()
 
 
 class WeekdaySelectFrame(tk.Frame):
@@ -592,15 +1370,25 @@ class WeekdaySelectFrame(tk.Frame):
         # Add widgets to grid
         for i in range(len(self.button_list)):
             self.button_list[i].grid(row=0, column=i, padx=4)
-            if habit:
-                if self.WEEKDAYS_STR[i] in habit["weekdays"]:
-                    self.button_list[i].select()
-            else:
-                self.button_list[i].select()
 
-    def get_weekdays(self):
+        self.bind_habit(habit)
+
+    def bind_habit(self, habit=None):
         """
-        Returns a list of all weekdays selected for the entered habit.
+        Selects the weekdays of a habit, or every weekday for a new habit.
+
+        habit: (type dict) A dictionary containing an individual habit's information.
+        """
+
+        for i in range(len(self.button_list)):
+            if not habit or self.WEEKDAYS_STR[i] in habit["weekdays"]:
+                self.button_list[i].select()
+            else:
+                self.button_list[i].deselect()
+
+    def get_weekdays(self):
+        """
+        Returns a list of all weekdays selected for the entered habit.
         """
 
         weekdays = []
@@ -651,13 +1439,25 @@ class HabitWindow(tk.Toplevel):
 
         self.create_habit_frame.grid(column=0, row=0)
 
+    def show(self, habit=None):
+        """
+        Shows this window again for another habit.
+
+        habit: (type dict) A dictionary containing an individual habit's information.
+        """
+
+        self.create_habit_frame.bind_habit(habit)
+        self.deiconify()
+        self.grab_set()
+
     def pass_focus(self):
         """
-        Forces the EditWindow into focus once this window is closed.
+        Hides this window so it can be reused, and forces the EditWindow into focus.
         """
 
+        self.grab_release()
+        self.withdraw()
         self.edit_canvas_frame.winfo_toplevel().grab_set()
-        self.destroy()
 
 
 class EditWindow(tk.Toplevel):
@@ -681,11 +1481,13 @@ class EditWindow(tk.Toplevel):
         self.parent = parent
         self.habit_list = habit_list
         self.main_canvas_frame = main_canvas_frame
+        self.habit_window = None
 
         # Set window attributes
         self.resizable(False, False)
         self.title("Edit")
         self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.hide)
 
         # Create widgets
         self.edit_canvas_frame = ScrollingCanvasFrame(parent=self,
@@ -700,16 +1502,39 @@ class EditWindow(tk.Toplevel):
         self.edit_canvas_frame.grid(column=0, row=0)
         self.btn_new_habit.grid(column=0, row=1, pady=5)
 
-    def open_habit_window(self):
+    def show(self):
         """
-        Creates a new Toplevel window for habit creation.
+        Shows this window again after it has been hidden.
         """
 
-        habit_window = HabitWindow(
-            parent=self.parent,
-            habit_list=self.habit_list,
-            main_canvas_frame=self.main_canvas_frame,
-            edit_canvas_frame=self.edit_canvas_frame)
+        self.deiconify()
+        self.grab_set()
+
+    def hide(self):
+        """
+        Hides this window so it can be reused the next time habits are managed.
+        """
+
+        self.grab_release()
+        self.withdraw()
+
+    def open_habit_window(self, habit=None):
+        """
+        Shows the Toplevel window for habit creation, or for editing a habit,
+        creating it the first time.
+
+        habit: (type dict) A dictionary containing an individual habit's information.
+        """
+
+        if self.habit_window and self.habit_window.winfo_exists():
+            self.habit_window.show(habit)
+        else:
+            self.habit_window = HabitWindow(
+                parent=self.parent,
+                habit_list=self.habit_list,
+                main_canvas_frame=self.main_canvas_frame,
+                habit=habit,
+                edit_canvas_frame=self.edit_canvas_frame)
 
 
 class TutorialWindow(tk.Toplevel):
@@ -743,188 +1568,2834 @@ class TutorialWindow(tk.Toplevel):
         self.content_frame.pack()
 
 
-def read_habit_file(filename, root):
+class HistoryWindow(tk.Toplevel):
     """
-    Reads a list of habits from a json file and returns them as a list of
-    dictionaries.
-    return type: list[dict]
-
-    filename: (type str) The name of a .json file containing habit information stored in
-    dictionaries separated by linebreaks.
-    root: (type tk.Tk) The root window of the program.
+    The Toplevel window showing a calendar heatmap of every day the user was
+    active. Each month is drawn as a pre-rendered image tile, and years are only
+    read from the archive and rendered once they are scrolled into view.
     """
 
-    habit_list = []
+    CELL_SIZE = 10  # Size of the square of a day in pixels
+    CELL_GAP = 2  # Space between the squares of two days in pixels
+    TILE_WIDTH = 6 * (CELL_SIZE + CELL_GAP)  # Six weeks touch every month
+    TILE_HEIGHT = 7 * (CELL_SIZE + CELL_GAP)
+    TILE_PADDING = 8  # Space around each tile in pixels
+    MONTH_LABEL_HEIGHT = 14  # Height of the label above each tile
+    YEAR_LABEL_HEIGHT = 24  # Height of the label above each year
+    MONTH_COLUMNS = 6  # Number of months shown side by side
+    YEAR_HEIGHT = YEAR_LABEL_HEIGHT + 2 * (MONTH_LABEL_HEIGHT + TILE_HEIGHT + TILE_PADDING)
+    CANVAS_WIDTH = MONTH_COLUMNS * (TILE_WIDTH + TILE_PADDING) + TILE_PADDING
+    CANVAS_HEIGHT = 300
 
-    # Attempt to read from filename, show tutorial if not found
-    try:
-        with open(filename, "r") as file:
-            file_text = file.read()
-    except FileNotFoundError:
-        tutorial_window = TutorialWindow(root, "tutorial.png")
-        return habit_list
+    ACTIVE_COLOR = "#40c463"
+    INACTIVE_COLOR = "#dfe2e2"
+    TILE_BACKGROUND_COLOR = "#ffffff"
 
-    file_list = file_text.splitlines()
+    MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 
-    # Parse file_list into dictionaries and append them to habit_list
-    for line in file_list:
-        habit = json.loads(line)
-        habit_list.append(habit)
+    # Rendered tiles are kept for the whole session: {(year, month): (days, tk.PhotoImage)}
+    tile_cache = {}
 
-    return habit_list
+    def __init__(self, parent, active_streak_list, streak_index):
+        """
+        HistoryWindow constructor.
 
+        parent: (type tk.Tk) The parent window of this window.
+        active_streak_list: (type list[dt.datetime]) A list of all days the user
+        was active in their current streak.
+        streak_index: (type dict) The index of the activity archive.
+        """
 
-def write_habits_to_file(filename, habit_list):
-    """
-    Stores a list of habits in a json file separated by linebreaks.
+        tk.Toplevel.__init__(self, parent)
 
-    filename: (type str) The name of a file to be created or overwritten to
-    store habit information.
-    habit_list: (type list[dict]) A list of dictionaries containing habit information.
-    """
+        # Initialize attributes
+        self.active_streak_list = active_streak_list
+        self.streak_index = streak_index
+        self.current_date = dt.datetime.today()
+        self.year_days = {}  # Active days of every drawn year: {year: set[str]}
+        self.tile_items = {}  # Canvas items of every drawn tile: {(year, month): int}
 
-    with open(filename, "w") as file:
-        for habit in habit_list:
-            habit_json = json.dumps(habit)
-            file.write(habit_json)
-            file.write("\n")
+        # Show the most recent year first
+        year_set = set(get_activity_years(ARCHIVE_DIR_NAME, active_streak_list, streak_index))
+        year_set.add(self.current_date.year)
+        self.years = sorted(year_set, reverse=True)
 
+        # Set window attributes
+        self.resizable(False, False)
+        self.title("History")
 
-def read_streak_file(filename, current_date):
-    """
-    Reads a list of active days from a text file and returns them as a list of 
-    datetime objects.
-    return type: list[dt.datetime]
+        # Create widgets
+        self.history_canvas = tk.Canvas(self,
+                                        width=self.CANVAS_WIDTH,
+                                        height=self.CANVAS_HEIGHT,
+                                        bg=self.TILE_BACKGROUND_COLOR)
+        self.history_scroll = tk.Scrollbar(self, orient=tk.VERTICAL)
 
-    filename: (type str) The name of a .txt file containing active days separated
-    by linebreaks.
-    """
+        # Add widgets to grid
+        self.history_canvas.grid(column=0, row=0)
+        self.history_scroll.grid(column=1, row=0, sticky="ns")
 
-    active_streak_list = []
+        # Configure scrolling, drawing years as they come into view
+        self.history_canvas.configure(scrollregion=(0, 0, self.CANVAS_WIDTH, len(self.years) * self.YEAR_HEIGHT))
+        self.history_scroll.configure(command=self.history_canvas.yview)
+        self.history_canvas.configure(yscrollcommand=self.canvas_scrolled)
 
-    # Attempt to read from filename, return current_date as start of streak if not found
-    try:
-        with open(filename, "r") as file:
-            file_text = file.read()
-    except FileNotFoundError:
-        active_streak_list.append(current_date)
-        return active_streak_list
+        self.draw_visible_years()
 
-    file_list = file_text.splitlines()
+    def canvas_scrolled(self, first, last):
+        """
+        Updates the scrollbar and draws the years scrolled into view.
 
-    # Parse file_list into datetime objects and append them to active_streak_list
-    for line in file_list:
-        day = dt.datetime.strptime(line, "%Y-%m-%d")
-        active_streak_list.append(day)
+        first: (type str) The top of the visible region as a fraction of the canvas.
+        last: (type str) The bottom of the visible region as a fraction of the canvas.
+        """
 
-    return active_streak_list
+        self.history_scroll.set(first, last)
+        self.draw_visible_years()
 
+    def draw_visible_years(self):
+        """
+        Draws every year in the visible region of the canvas that has not been
+        drawn yet.
+        """
 
-def write_streak_file(filename, active_streak_list):
-    """
-    Stores a list of days the user was active in a text file separated by linebreaks.
+        top = self.history_canvas.canvasy(0)
+        bottom = self.history_canvas.canvasy(self.CANVAS_HEIGHT)
 
-    filename: (type str) The name of a file to be created or overwritten to
-    store streak information.
-    active_streak_list: (type list[dt.datetime]) A list of all days the user
-    was active in their current streak.
-    """
+        for index, year in enumerate(self.years):
+            if year not in self.year_days and top < (index + 1) * self.YEAR_HEIGHT and index * self.YEAR_HEIGHT < bottom:
+                self.draw_year(index, year)
 
-    with open(filename, "w") as file:
-        for day in active_streak_list:
-            file.write(day.strftime("%Y-%m-%d"))
-            file.write("\n")
+    def draw_year(self, index, year):
+        """
+        Reads the active days of a year from the archive and draws its label and
+        month tiles.
 
+        index: (type int) The position of the year on the canvas.
+        year: (type int) The year to be drawn.
+        """
 
-def uncheck_all_habits(habit_list):
-    """
-    Sets all habits to unchecked at the start of a new day.
+        self.year_days[year] = {day.strftime("%Y-%m-%d") for day in
+                                read_activity_history(ARCHIVE_DIR_NAME, year, self.active_streak_list, self.streak_index)}
+
+        self.history_canvas.create_text(self.TILE_PADDING,
+                                        index * self.YEAR_HEIGHT + self.YEAR_LABEL_HEIGHT // 2,
+                                        text=str(year),
+                                        anchor="w",
+                                        font=(DEFAULT_FONT, 11))
+
+        for month in range(1, 13):
+            x = self.TILE_PADDING + (month - 1) % self.MONTH_COLUMNS * (self.TILE_WIDTH + self.TILE_PADDING)
+            y = (index * self.YEAR_HEIGHT
+                 + self.YEAR_LABEL_HEIGHT
+                 + (month - 1) // self.MONTH_COLUMNS * (self.MONTH_LABEL_HEIGHT + self.TILE_HEIGHT + self.TILE_PADDING))
+
+            self.history_canvas.create_text(x,
+                                            y,
+                                            text=self.MONTH_NAMES[month - 1],
+                                            anchor="nw",
+                                            font=(DEFAULT_FONT, 8))
+            self.tile_items[(year, month)] = self.history_canvas.create_image(x,
+                                                                              y + self.MONTH_LABEL_HEIGHT,
+                                                                              image=self.get_tile(year, month),
+                                                                              anchor="nw")
+
+    def get_month_days(self, year, month):
+        """
+        Returns the days of a month the user was active on.
+        return type: frozenset[int]
 
-    habit_list: (type list[dict]) A list of dictionaries containing habit information.
-    """
+        year: (type int) The year of the month.
+        month: (type int) The month.
+        """
 
-    for habit in habit_list:
-        habit["checked"] = False
+        prefix = f"{year}-{month:02}-"
+        day_set = self.year_days.get(year, set())
 
+        # The current month changes while the program runs, so read it from the streak
+        if (year, month) == (self.current_date.year, self.current_date.month):
+            day_set = day_set | {day.strftime("%Y-%m-%d") for day in self.active_streak_list}
 
-def manage_streak(active_streak_list, current_date):
-    """
-    Manages the current streak, resetting the streak if too many days have passed.
+        return frozenset(int(day[-2:]) for day in day_set if day.startswith(prefix))
 
-    active_streak_list: (type list[dt.datetime]) A list of all days the user
-    was active in their current streak.
-    current_date: (type dt.datetime) The current date as a dt.datetime object.
-    """
+    def get_tile(self, year, month):
+        """
+        Returns the rendered tile of a month, rendering it only if it is not cached
+        or its active days have changed.
+        return type: tk.PhotoImage
 
-    days_passed = current_date - active_streak_list[-1]
+        year: (type int) The year of the month.
+        month: (type int) The month.
+        """
 
-    # Clear streak if the number of days passed is higher than the grace period
-    if days_passed > dt.timedelta(days=GRACE_PERIOD):
-        active_streak_list.clear()
-        active_streak_list.append(current_date)
+        days = self.get_month_days(year, month)
+        cached_tile = self.tile_cache.get((year, month))
 
+        if cached_tile and cached_tile[0] == days:
+            return cached_tile[1]
 
-def get_image_file(active_streak_list):
-    """
-    Returns the name of an image file to be displayed in MainWindow according to
-    current streak length.
+        tile = self.render_tile(year, month, days)
+        self.tile_cache[(year, month)] = (days, tile)
 
-    active_streak_list: (type list[dt.datetime]) A list of all days the user
-    was active in their current streak.
+        return tile
+
+    def render_tile(self, year, month, days):
+        """
+        Renders the squares of every day of a month into an image, one column per
+        week and one row per weekday starting on Sunday.
+        return type: tk.PhotoImage
+
+        year: (type int) The year of the month.
+        month: (type int) The month.
+        days: (type frozenset[int]) The days of the month the user was active on.
+        """
+
+        tile = tk.PhotoImage(width=self.TILE_WIDTH, height=self.TILE_HEIGHT)
+        tile.put(self.TILE_BACKGROUND_COLOR, to=(0, 0, self.TILE_WIDTH, self.TILE_HEIGHT))
+
+        first_day = dt.date(year, month, 1)
+        first_row = (first_day.weekday() + 1) % 7
+        day_count = (dt.date(year + month // 12, month % 12 + 1, 1) - first_day).days
+
+        for day in range(1, day_count + 1):
+            column, row = divmod(first_row + day - 1, 7)
+            x = column * (self.CELL_SIZE + self.CELL_GAP)
+            y = row * (self.CELL_SIZE + self.CELL_GAP)
+            color = self.ACTIVE_COLOR if day in days else self.INACTIVE_COLOR
+            tile.put(color, to=(x, y, x + self.CELL_SIZE, y + self.CELL_SIZE))
+
+        return tile
+
+    def update_current_month(self):
+        """
+        Re-renders the tile of the current month if its active days have changed.
+        """
+
+        key = (self.current_date.year, self.current_date.month)
+
+        if key in self.tile_items:
+            self.history_canvas.itemconfig(self.tile_items[key], image=self.get_tile(*key))
+
+
+class HabitDaemon:
+    """
+    A long-lived local server that keeps the habits in memory and serves them as
+    JSON over HTTP, so the GUI, scripts and widgets can share one process instead
+    of each parsing the data files.
     """
 
-    streak_length = len(active_streak_list)
+    HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Content Too Large", 500: "Internal Server Error"}
 
-    # Select a plant image to return based on streak_length
-    if streak_length <= 1:
-        return "plant1.png"
-    elif streak_length <= 3:
-        return "plant2.png"
-    elif streak_length <= 7:
-        return "plant3.png"
-    elif streak_length <= 13:
-        return "plant4.png"
-    elif streak_length <= 25:
-        return "plant5.png"
-    elif streak_length <= 39:
-        return "plant6.png"
-    else:
-        return "plant7.png"
+    def __init__(self, host=DAEMON_HOST, port=DAEMON_PORT):
+        """
+        HabitDaemon constructor.
 
+        host: (type str) The address the daemon listens on.
+        port: (type int) The port the daemon listens on.
+        """
 
-def main():
+        # Initialize attributes
+        self.host = host
+        self.port = port
+        self.current_date = dt.datetime.today()
+        (self.habit_list,
+         self.active_streak_list,
+         self.streak_index,
+         self.value_columns,
+         self.file_signatures) = load_data_files(self.current_date)
+        self.habit_snapshot = copy.deepcopy(self.habit_list)
+        self.changed = False
+        self.request_metrics = {}
+        self.recurrence_index = None  # Built on the first request, cleared when the day changes
+
+    async def serve(self):
+        """
+        Serves requests until the daemon is stopped, writing changed habits to
+        file in batches and once more on shutdown.
+        """
 
-    current_date = dt.datetime.today()
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]  # The port chosen by the system if port was 0
+        persist_task = asyncio.create_task(self.persist_periodically())
 
-    # Configure root window
-    root = tk.Tk()
-    root.resizable(False, False)
-    root.title("Just Habits")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            persist_task.cancel()
+            self.persist()
 
-    # Configure habit_list and active_streak_list
-    habit_list = read_habit_file(HABIT_FILE_NAME, root)
-    active_streak_list = read_streak_file(STREAK_FILE_NAME, current_date)
-    manage_streak(active_streak_list, current_date)
+    async def persist_periodically(self):
+        """
+        Writes changed habits to file every DAEMON_PERSIST_INTERVAL seconds.
+        """
 
-    # Clear checkboxes if it's a new day
-    if active_streak_list[-1].strftime("%Y-%m-%d") != current_date.strftime("%Y-%m-%d"):
-        uncheck_all_habits(habit_list)
+        while True:
+            await asyncio.sleep(DAEMON_PERSIST_INTERVAL)
+            self.persist(blocking=False)
 
-    plant_image_file = get_image_file(active_streak_list)
+    def persist(self, blocking=True):
+        """
+        Writes the habits and streak to file if they have changed, merging in any
+        changes made by other instances of the program.
 
-    content_frame = MainWindow(parent=root,
-                               image_file=plant_image_file,
-                               habit_list=habit_list,
-                               current_date=current_date,
-                               active_streak_list=active_streak_list)
+        blocking: (type bool) Whether to wait for another instance to release the
+        lock. If False and the lock is held, the write is left for the next try,
+        so requests are never stalled by another instance.
+        """
 
-    content_frame.grid(column=0, row=0)
+        if not self.changed and get_data_file_signatures() == self.file_signatures:
+            return
+
+        try:
+            self.habit_snapshot, self.file_signatures = save_data_files(
+                self.habit_list,
+                self.habit_snapshot,
+                self.active_streak_list,
+                self.streak_index,
+                self.file_signatures,
+                self.current_date,
+                self.value_columns,
+                blocking)
+        except BlockingIOError:
+            return
+        self.changed = False
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads HTTP requests from a client connection and writes a JSON response
+        for each, keeping the connection open between requests.
 
-    root.mainloop()
+        reader: (type asyncio.StreamReader) The stream of the client's requests.
+        writer: (type asyncio.StreamWriter) The stream of the daemon's responses.
+        """
 
-    # Write habits and streak to file after root window is closed
-    write_habits_to_file(HABIT_FILE_NAME, habit_list)
-    write_streak_file(STREAK_FILE_NAME, active_streak_list)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                # Read headers
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                # Answer requests that cannot be read and close the connection, as
+                # the start of the next request is unknown
+                request_parts = request_line.decode("latin-1").split()
+                content_length = headers.get("content-length", "0")
+                if len(request_parts) != 3:
+                    error_status, error = 400, "Malformed request line"
+                elif not re.fullmatch("[0-9]+", content_length):
+                    error_status, error = 400, "Content-Length must be a non-negative integer"
+                elif int(content_length) > DAEMON_MAX_BODY_SIZE:
+                    error_status, error = 413, f"Request body is larger than {DAEMON_MAX_BODY_SIZE} bytes"
+                else:
+                    error_status, error = None, None
+
+                if error_status:
+                    writer.write(self.encode_response(error_status, {"error": error}, False))
+                    await writer.drain()
+                    break
+
+                method, target, version = request_parts
+                body = await reader.readexactly(int(content_length))
+
+                # Handle the request and record its latency
+                start_time = time.perf_counter()
+                route, status, payload = self.dispatch(method, urllib.parse.urlsplit(target).path, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                response = self.encode_response(status, payload, keep_alive)
+                self.record_latency(route, time.perf_counter() - start_time)
+
+                writer.write(response)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def encode_response(self, status, payload, keep_alive):
+        """
+        Returns an HTTP response with a JSON payload.
+        return type: bytes
+
+        status: (type int) The HTTP status of the response.
+        payload: (type object) The payload of the response.
+        keep_alive: (type bool) Whether the connection stays open for more requests.
+        """
+
+        response_body = json.dumps(payload).encode()
+
+        return (f"HTTP/1.1 {status} {self.HTTP_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(response_body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                + response_body)
+
+    def dispatch(self, method, path, body):
+        """
+        Routes a request to the method handling it.
+        Returns the name of the route, the HTTP status and the response payload.
+        return type: tuple[str, int, object]
+
+        method: (type str) The HTTP method of the request.
+        path: (type str) The path of the request.
+        body: (type bytes) The body of the request, containing JSON or nothing.
+        """
+
+        parts = path.strip("/").split("/")
+
+        if parts == ["habits"]:
+            route, handlers = "/habits", {"GET": self.get_habits}
+        elif parts == ["habits", "today"]:
+            route, handlers = "/habits/today", {"GET": self.get_habits_today}
+        elif parts == ["habits", "week"]:
+            route, handlers = "/habits/week", {"GET": self.get_habits_week}
+        elif parts == ["habits", "reorder"]:
+            route, handlers = "/habits/reorder", {"POST": self.reorder_habit}
+        elif len(parts) == 3 and parts[0] == "habits" and parts[2] == "check":
+            route, handlers = "/habits/{id}/check", {"POST": lambda request: self.check_habit_by_id(parts[1], request)}
+        elif len(parts) == 3 and parts[0] == "habits" and parts[2] == "value":
+            route, handlers = "/habits/{id}/value", {
+                "GET": lambda request: self.get_habit_value(parts[1], request),
+                "POST": lambda request: self.record_value_by_id(parts[1], request)
+            }
+        elif parts == ["streak"]:
+            route, handlers = "/streak", {"GET": self.get_streak}
+        elif parts == ["metrics"]:
+            route, handlers = "/metrics", {"GET": self.get_metrics}
+        elif parts == ["sync", "push"]:
+            route, handlers = "/sync/push", {"POST": self.push_sync_delta}
+        elif parts == ["sync", "pull"]:
+            route, handlers = "/sync/pull", {"POST": self.pull_sync_deltas}
+        else:
+            # Unknown paths share one route name, so the metrics stay bounded
+            return "unknown", 404, {"error": f"Unknown path {path}"}
+
+        if method not in handlers:
+            return route, 405, {"error": f"{method} is not allowed on {route}"}
+
+        try:
+            request = json.loads(body) if body else {}
+        except ValueError:
+            return f"{method} {route}", 400, {"error": "Request body is not valid JSON"}
+
+        if not isinstance(request, dict):
+            return f"{method} {route}", 400, {"error": "Request body must be a JSON object"}
+
+        self.update_current_date()
+
+        # Answer malformed requests and unexpected failures instead of dropping
+        # the connection
+        try:
+            status, payload = handlers[method](request)
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+            status, payload = 400, {"error": f"Invalid request: {error!r}"}
+        except Exception as error:
+            status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+
+        return f"{method} {route}", status, payload
+
+    def update_current_date(self):
+        """
+        Starts a new day once the date changes, managing the streak and clearing
+        the checkboxes the same way the program does at startup.
+        """
+
+        today = dt.datetime.today()
+
+        if today.strftime("%Y-%m-%d") != self.current_date.strftime("%Y-%m-%d"):
+            self.current_date = today
+            self.recurrence_index = None
+            manage_streak(self.active_streak_list, self.current_date, self.streak_index, self.habit_list)
+            if self.active_streak_list[-1].strftime("%Y-%m-%d") != self.current_date.strftime("%Y-%m-%d"):
+                uncheck_all_habits(self.habit_list)
+            for column in self.value_columns.values():
+                column.advance_to(self.current_date)
+            self.changed = True
+
+    def get_habits(self, request):
+        """
+        Returns every habit.
+        return type: tuple[int, list[dict]]
+
+        request: (type dict) The decoded body of the request.
+        """
+
+        return 200, self.habit_list
+
+    def get_habits_today(self, request):
+        """
+        Returns the habits scheduled for today.
+        return type: tuple[int, list[dict]]
+
+        request: (type dict) The decoded body of the request.
+        """
+
+        return 200, self.get_recurrence_index().get_due_habits(self.current_date)
+
+    def get_habits_week(self, request):
+        """
+        Returns the ids of the habits due on each of the next seven days.
+        return type: tuple[int, dict]
+
+        request: (type dict) The decoded body of the request.
+        """
+
+        recurrence_index = self.get_recurrence_index()
+        week = {}
+
+        for days in range(RECURRENCE_LOOKAHEAD_DAYS):
+            date = self.current_date + dt.timedelta(days=days)
+            week[date.strftime("%Y-%m-%d")] = [habit["id"] for habit in recurrence_index.get_due_habits(date)]
+
+        return 200, week
+
+    def get_recurrence_index(self):
+        """
+        Returns the RecurrenceIndex of the habits from today on, updated for the
+        habits changed since it was last used.
+        return type: RecurrenceIndex
+        """
+
+        if self.recurrence_index is None:
+            self.recurrence_index = RecurrenceIndex(
+                self.habit_list,
+                self.current_date,
+                self.current_date + dt.timedelta(days=RECURRENCE_LOOKAHEAD_DAYS - 1))
+        else:
+            self.recurrence_index.update(self.habit_list)
+
+        return self.recurrence_index
+
+    def check_habit_by_id(self, habit_id, request):
+        """
+        Checks or unchecks a habit, extending the streak. Count and duration habits
+        are only checked by reaching their target through /habits/{id}/value.
+        return type: tuple[int, dict]
+
+        habit_id: (type str) The id of the habit.
+        request: (type dict) The decoded body of the request, optionally
+        containing "checked".
+        """
+
+        for habit in self.habit_list:
+            if habit["id"] == habit_id:
+                if is_quantitative_habit(habit):
+                    return 400, {"error": f"Habit {habit_id} is a count or duration habit, record a value instead"}
+                check_habit(habit, bool(request.get("checked", True)), self.active_streak_list, self.current_date)
+                self.changed = True
+                return 200, habit
+
+        return 404, {"error": f"No habit with id {habit_id}"}
+
+    def get_habit_value(self, habit_id, request):
+        """
+        Returns today's value of a quantitative habit, with the rolling sums and
+        daily averages of the last 7, 30 and 365 days.
+        return type: tuple[int, dict]
+
+        habit_id: (type str) The id of the habit.
+        request: (type dict) The decoded body of the request.
+        """
+
+        for habit in self.habit_list:
+            if habit["id"] == habit_id:
+                if not is_quantitative_habit(habit):
+                    return 400, {"error": f"Habit {habit_id} is not a count or duration habit"}
+                column = self.value_columns.setdefault(habit_id, HabitValueColumn(self.current_date))
+                return 200, {"habit": habit, **column.get_stats()}
+
+        return 404, {"error": f"No habit with id {habit_id}"}
+
+    def record_value_by_id(self, habit_id, request):
+        """
+        Adds to today's value of a quantitative habit, checking the habit once its
+        target is reached.
+        return type: tuple[int, dict]
+
+        habit_id: (type str) The id of the habit.
+        request: (type dict) The decoded body of the request, containing "amount".
+        """
+
+        if not isinstance(request.get("amount"), int):
+            return 400, {"error": "amount must be an integer"}
+
+        for habit in self.habit_list:
+            if habit["id"] == habit_id and is_quantitative_habit(habit):
+                record_habit_value(habit, request["amount"], self.value_columns, self.active_streak_list, self.current_date)
+                self.changed = True
+                return self.get_habit_value(habit_id, request)
+
+        # Report a missing habit or a checkbox habit
+        return self.get_habit_value(habit_id, request)
+
+    def reorder_habit(self, request):
+        """
+        Moves a habit to a new index in the habit list.
+        return type: tuple[int, list[dict]]
+
+        request: (type dict) The decoded body of the request, containing "id" and
+        "index".
+        """
+
+        for habit in self.habit_list:
+            if habit["id"] == request.get("id"):
+                if not isinstance(request.get("index"), int):
+                    return 400, {"error": "index must be an integer"}
+                self.habit_list.remove(habit)
+                self.habit_list.insert(max(0, request["index"]), habit)
+                self.changed = True
+                return 200, self.habit_list
+
+        return 404, {"error": f"No habit with id {request.get('id')}"}
+
+    def get_streak(self, request):
+        """
+        Returns the length of the current streak, the last active day and the
+        plant image shown for it.
+        return type: tuple[int, dict]
+
+        request: (type dict) The decoded body of the request.
+        """
+
+        return 200, {
+            "length": get_streak_length(self.active_streak_list, self.streak_index),
+            "last_active_day": self.active_streak_list[-1].strftime("%Y-%m-%d"),
+            "image_file": get_image_file(self.active_streak_list, self.streak_index)
+        }
+
+    def record_latency(self, route, latency):
+        """
+        Adds the latency of a handled request to the metrics of its route.
+
+        route: (type str) The name of the route.
+        latency: (type float) The time spent handling the request in seconds.
+        """
+
+        if route not in self.request_metrics:
+            self.request_metrics[route] = {
+                "count": 0,
+                "total": 0.0,
+                "samples": collections.deque(maxlen=DAEMON_LATENCY_SAMPLES)
+            }
+
+        metrics = self.request_metrics[route]
+        metrics["count"] += 1
+        metrics["total"] += latency
+        metrics["samples"].append(latency)
+
+    def get_metrics(self, request):
+        """
+        Returns the request count and latencies in milliseconds of every route.
+        return type: tuple[int, dict]
+
+        request: (type dict) The decoded body of the request.
+        """
+
+        route_metrics = {}
+
+        for route, metrics in self.request_metrics.items():
+            samples = sorted(metrics["samples"])
+            route_metrics[route] = {
+                "count": metrics["count"],
+                "mean_ms": metrics["total"] / metrics["count"] * 1000,
+                "p50_ms": samples[len(samples) // 2] * 1000,
+                "p95_ms": samples[int(len(samples) * 0.95)] * 1000,
+                "max_ms": samples[-1] * 1000
+            }
+
+        return 200, route_metrics
+
+    def push_sync_delta(self, request):
+        """
+        Stores a sync delta sent by a replica, so the daemon can stand in for a
+        shared sync directory.
+        return type: tuple[int, dict]
+
+        request: (type dict) The decoded body of the request, containing
+        "replica_id", "seq" and "delta".
+        """
+
+        if not is_valid_sync_position(request.get("replica_id"), request.get("seq")):
+            return 400, {"error": "replica_id must be a uuid hex string and seq a positive integer"}
+        if not isinstance(request.get("delta"), dict):
+            return 400, {"error": "delta must be an object"}
+
+        DirectorySyncTransport(SYNC_RELAY_DIR_NAME).push(request["replica_id"], request["seq"], request["delta"])
+
+        return 200, {}
+
+    def pull_sync_deltas(self, request):
+        """
+        Returns the stored sync deltas a replica has not seen yet.
+        return type: tuple[int, list]
+
+        request: (type dict) The decoded body of the request, containing
+        "replica_id" and "seen".
+        """
+
+        if not isinstance(request.get("replica_id"), str) or not isinstance(request.get("seen"), dict):
+            return 400, {"error": "replica_id must be a string and seen an object"}
+
+        return 200, DirectorySyncTransport(SYNC_RELAY_DIR_NAME).pull(request["replica_id"], request["seen"])
+
+
+class DirectorySyncTransport:
+    """
+    Exchanges sync deltas through a shared directory. Every replica writes its
+    deltas as numbered files into its own subdirectory and reads the others'.
+    """
+
+    def __init__(self, sync_dir):
+        """
+        DirectorySyncTransport constructor.
+
+        sync_dir: (type str) The name of the shared directory.
+        """
+
+        self.sync_dir = sync_dir
+
+    def push(self, replica_id, seq, delta):
+        """
+        Stores a delta of a replica.
+
+        replica_id: (type str) The id of the replica that made the changes.
+        seq: (type int) The sequence number of the delta.
+        delta: (type dict) The changed registers and active days.
+        """
+
+        # The id and sequence number become part of a path, so nothing else is accepted
+        if not is_valid_sync_position(replica_id, seq):
+            raise ValueError("replica_id must be a uuid hex string and seq a positive integer")
+
+        replica_dir = os.path.join(self.sync_dir, replica_id)
+        os.makedirs(replica_dir, exist_ok=True)
+
+        filename = os.path.join(replica_dir, f"{seq:08}.json")
+        with open(filename + ".tmp", "w") as file:
+            json.dump(delta, file)
+        os.replace(filename + ".tmp", filename)
+
+    def pull(self, replica_id, seen):
+        """
+        Returns the deltas of every other replica that have not been seen yet.
+        return type: list[tuple[str, int, dict]]
+
+        replica_id: (type str) The id of the replica pulling the deltas.
+        seen: (type dict) The last sequence number seen of every other replica.
+        """
+
+        deltas = []
+
+        if not os.path.isdir(self.sync_dir):
+            return deltas
+
+        for other_replica_id in sorted(os.listdir(self.sync_dir)):
+            if other_replica_id == replica_id or not re.fullmatch(REPLICA_ID_PATTERN, other_replica_id):
+                continue
+
+            for filename in sorted(os.listdir(os.path.join(self.sync_dir, other_replica_id))):
+                if re.fullmatch("[0-9]{8}\\.json", filename) and int(filename[:-5]) > seen.get(other_replica_id, 0):
+                    with open(os.path.join(self.sync_dir, other_replica_id, filename), "r") as file:
+                        deltas.append((other_replica_id, int(filename[:-5]), json.load(file)))
+
+        return deltas
+
+
+class HttpSyncTransport:
+    """
+    Exchanges sync deltas through a HabitDaemon standing in for a sync server.
+    """
+
+    def __init__(self, host=DAEMON_HOST, port=DAEMON_PORT):
+        """
+        HttpSyncTransport constructor.
+
+        host: (type str) The address the daemon listens on.
+        port: (type int) The port the daemon listens on.
+        """
+
+        self.host = host
+        self.port = port
+
+    def push(self, replica_id, seq, delta):
+        """
+        Sends a delta of a replica to the daemon. Raises ConnectionError if the
+        daemon does not accept it.
+
+        replica_id: (type str) The id of the replica that made the changes.
+        seq: (type int) The sequence number of the delta.
+        delta: (type dict) The changed registers and active days.
+        """
+
+        status, payload = request_daemon("POST",
+                                         "/sync/push",
+                                         {"replica_id": replica_id, "seq": seq, "delta": delta},
+                                         host=self.host,
+                                         port=self.port)
+
+        if status != 200:
+            raise ConnectionError(f"Sync push failed with status {status}: {payload}")
+
+    def pull(self, replica_id, seen):
+        """
+        Returns the deltas of every other replica that have not been seen yet.
+        Raises ConnectionError if the daemon does not answer with the deltas.
+        return type: list[tuple[str, int, dict]]
+
+        replica_id: (type str) The id of the replica pulling the deltas.
+        seen: (type dict) The last sequence number seen of every other replica.
+        """
+
+        status, deltas = request_daemon("POST",
+                                        "/sync/pull",
+                                        {"replica_id": replica_id, "seen": seen},
+                                        host=self.host,
+                                        port=self.port)
+
+        if status != 200:
+            raise ConnectionError(f"Sync pull failed with status {status}: {deltas}")
+
+        return [tuple(delta) for delta in deltas]
+
+
+class RecurrenceIndex:
+    """
+    An index of the days each habit is due within a range of days, built by
+    jumping from one occurrence to the next instead of checking every habit on
+    every day. The index is kept up to date by finding the days again only for
+    habits whose schedule has changed.
+    """
+
+    def __init__(self, habit_list, first_date, last_date):
+        """
+        RecurrenceIndex constructor.
+
+        habit_list: (type list[dict]) A list of dictionaries containing habit information.
+        first_date: (type dt.datetime) The first day covered by the index.
+        last_date: (type dt.datetime) The last day covered by the index.
+        """
+
+        # Initialize attributes
+        self.first_ordinal = first_date.toordinal()
+        self.last_ordinal = last_date.toordinal()
+        self.habit_list = habit_list
+        self.schedules = {}  # The schedule each habit was indexed with: {id: tuple[dict, dict]}
+        self.due_habit_ids = {}  # Ids of the habits due on every day: {ordinal: set[str]}
+
+        self.update(habit_list)
+
+    def update(self, habit_list):
+        """
+        Brings the index up to date with habit_list. Only habits that were added,
+        removed, or whose recurrence rule or week checks changed are indexed again.
+
+        habit_list: (type list[dict]) A list of dictionaries containing habit information.
+        """
+
+        self.habit_list = habit_list
+        habit_ids = set()
+
+        for habit in habit_list:
+            habit_ids.add(habit["id"])
+            schedule = (get_recurrence_rule(habit), habit.get("week_checks"))
+            if self.schedules.get(habit["id"]) == schedule:
+                continue
+
+            self.remove_habit(habit["id"])
+            self.schedules[habit["id"]] = copy.deepcopy(schedule)
+            ordinal = get_next_occurrence(habit, self.first_ordinal)
+
+            while ordinal is not None and ordinal <= self.last_ordinal:
+                self.due_habit_ids.setdefault(ordinal, set()).add(habit["id"])
+                ordinal = get_next_occurrence(habit, ordinal + 1)
+
+        for habit_id in set(self.schedules) - habit_ids:
+            self.remove_habit(habit_id)
+
+    def remove_habit(self, habit_id):
+        """
+        Removes a habit from every day of the index.
+
+        habit_id: (type str) The id of the habit.
+        """
+
+        if self.schedules.pop(habit_id, None) is None:
+            return
+
+        for due_ids in self.due_habit_ids.values():
+            due_ids.discard(habit_id)
+
+    def get_due_habits(self, date):
+        """
+        Returns the habits due on a day, in the order of habit_list.
+        return type: list[dict]
+
+        date: (type dt.datetime) A day covered by the index.
+        """
+
+        due_ids = self.due_habit_ids.get(date.toordinal())
+        if not due_ids:
+            return []
+
+        return [habit for habit in self.habit_list if habit["id"] in due_ids]
+
+
+class HabitValueColumn:
+    """
+    The values entered for a quantitative habit, stored in an array with one
+    entry per day. The rolling sums over the ROLLING_WINDOWS days ending today
+    are updated as values are entered and as days pass, instead of being summed
+    again whenever they are shown. The values as they were last read from or
+    written to the value file are kept to merge changes made by other instances.
+    """
+
+    def __init__(self, current_date, start_ordinal=None, values=()):
+        """
+        HabitValueColumn constructor.
+
+        current_date: (type dt.datetime) The current date as a dt.datetime object.
+        start_ordinal: (type int) The day of the first value as a date ordinal,
+        current_date if not given.
+        values: (type list[int]) The value of every day from start_ordinal on.
+        """
+
+        # Initialize attributes
+        self.today_ordinal = current_date.toordinal()
+        self.start_ordinal = start_ordinal if start_ordinal is not None else self.today_ordinal
+        self.values = array.array("l", values)
+        self.sums = {}  # Sum of the values of the last days: {window: int}
+
+        self.sum_windows()
+        self.mark_saved()
+
+    def mark_saved(self, saved_column=None):
+        """
+        Remembers the values stored in the value file, the current values if
+        saved_column is not given.
+
+        saved_column: (type HabitValueColumn) The values as they were read from
+        the value file.
+        """
+
+        saved_column = saved_column or self
+        self.saved_start_ordinal = saved_column.start_ordinal
+        self.saved_values = array.array("l", saved_column.values)
+
+    def get_saved_value(self, ordinal):
+        """
+        Returns the value of a day as it was last read from or written to the
+        value file, 0 if no value was stored.
+        return type: int
+
+        ordinal: (type int) The day as a date ordinal.
+        """
+
+        index = ordinal - self.saved_start_ordinal
+
+        if 0 <= index < len(self.saved_values):
+            return self.saved_values[index]
+
+        return 0
+
+    def sum_windows(self):
+        """
+        Sums the values of every rolling window ending today.
+        """
+
+        for window in ROLLING_WINDOWS:
+            first_index = max(0, self.today_ordinal - window + 1 - self.start_ordinal)
+            last_index = max(0, self.today_ordinal + 1 - self.start_ordinal)
+            self.sums[window] = sum(self.values[first_index:last_index])
+
+    def get_value(self, ordinal):
+        """
+        Returns the value of a day, 0 if no value was entered.
+        return type: int
+
+        ordinal: (type int) The day as a date ordinal.
+        """
+
+        index = ordinal - self.start_ordinal
+
+        if 0 <= index < len(self.values):
+            return self.values[index]
+
+        return 0
+
+    def add_value(self, ordinal, amount):
+        """
+        Adds an amount to the value of a day, without going below 0, and updates
+        the rolling sums containing that day. Returns the new value of the day.
+        return type: int
+
+        ordinal: (type int) The day as a date ordinal.
+        amount: (type int) The amount to add, negative to remove.
+        """
+
+        # Grow the array to cover the day
+        if ordinal < self.start_ordinal:
+            self.values[0:0] = array.array("l", [0] * (self.start_ordinal - ordinal))
+            self.start_ordinal = ordinal
+        index = ordinal - self.start_ordinal
+        if index >= len(self.values):
+            self.values.extend([0] * (index + 1 - len(self.values)))
+
+        amount = max(amount, -self.values[index])
+        self.values[index] += amount
+
+        for window in ROLLING_WINDOWS:
+            if self.today_ordinal - window < ordinal <= self.today_ordinal:
+                self.sums[window] += amount
+
+        return self.values[index]
+
+    def advance_to(self, current_date):
+        """
+        Moves the rolling windows forward to end on current_date, subtracting the
+        days that leave each window and adding the days that enter it.
+
+        current_date: (type dt.datetime) The current date as a dt.datetime object.
+        """
+
+        new_ordinal = current_date.toordinal()
+
+        # Sum again if every window has moved past its old days
+        if new_ordinal - self.today_ordinal > max(ROLLING_WINDOWS):
+            self.today_ordinal = new_ordinal
+            self.sum_windows()
+            return
+
+        for ordinal in range(self.today_ordinal + 1, new_ordinal + 1):
+            for window in ROLLING_WINDOWS:
+                self.sums[window] += self.get_value(ordinal) - self.get_value(ordinal - window)
+
+        self.today_ordinal = max(self.today_ordinal, new_ordinal)
+
+    def get_stats(self):
+        """
+        Returns today's value and the rolling sums and daily averages of every window.
+        return type: dict
+        """
+
+        return {
+            "value": self.get_value(self.today_ordinal),
+            "sums": {window: self.sums[window] for window in ROLLING_WINDOWS},
+            "averages": {window: self.sums[window] / window for window in ROLLING_WINDOWS}
+        }
+
+
+def read_habit_file(filename, root=None):
+    """
+    Reads a list of habits from a json file and returns them as a list of
+    dictionaries.
+    return type: list[dict]
+
+    filename: (type str) The name of a .json file containing habit information stored in
+    dictionaries separated by linebreaks.
+    root: (type tk.Tk) The root window of the program. The tutorial is only shown
+    if a root window is given.
+    """
+
+    habit_list = []
+
+    # Attempt to read from filename, show tutorial if not found
+    try:
+        with open(filename, "r") as file:
+            file_text = file.read()
+    except FileNotFoundError:
+        if root:
+            tutorial_window = TutorialWindow(root, "tutorial.png")
+        return habit_list
+
+    file_list = file_text.splitlines()
+
+    # Parse file_list into dictionaries and append them to habit_list
+    for line in file_list:
+        habit = json.loads(line)
+
+        # Give habits from older files an id that every instance agrees on
+        if "id" not in habit:
+            habit["id"] = uuid.uuid5(uuid.NAMESPACE_OID, f"{len(habit_list)}:{habit['name']}").hex
+
+        habit_list.append(habit)
+
+    return habit_list
+
+
+def write_habits_to_file(filename, habit_list):
+    """
+    Stores a list of habits in a json file separated by linebreaks.
+
+    filename: (type str) The name of a file to be created or overwritten to
+    store habit information.
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    """
+
+    with open(filename, "w") as file:
+        for habit in habit_list:
+            habit_json = json.dumps(habit)
+            file.write(habit_json)
+            file.write("\n")
+
+
+def read_streak_file(filename, current_date):
+    """
+    Reads a list of active days from a text file and returns them as a list of 
+    datetime objects.
+    return type: list[dt.datetime]
+
+    filename: (type str) The name of a .txt file containing active days separated
+    by linebreaks.
+    """
+
+    active_streak_list = []
+
+    # Attempt to read from filename, return current_date as start of streak if not found
+    try:
+        with open(filename, "r") as file:
+            file_text = file.read()
+    except FileNotFoundError:
+        active_streak_list.append(current_date)
+        return active_streak_list
+
+    file_list = file_text.splitlines()
+
+    # Parse file_list into datetime objects and append them to active_streak_list
+    for line in file_list:
+        day = dt.datetime.strptime(line, "%Y-%m-%d")
+        active_streak_list.append(day)
+
+    return active_streak_list
+
+
+def write_streak_file(filename, active_streak_list):
+    """
+    Stores a list of days the user was active in a text file separated by linebreaks.
+
+    filename: (type str) The name of a file to be created or overwritten to
+    store streak information.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    """
+
+    with open(filename, "w") as file:
+        for day in active_streak_list:
+            file.write(day.strftime("%Y-%m-%d"))
+            file.write("\n")
+
+
+def read_value_file(filename, current_date):
+    """
+    Reads the values of the quantitative habits from a json file and returns
+    them as a dictionary of HabitValueColumns.
+    return type: dict[str, HabitValueColumn]
+
+    filename: (type str) The name of a .json file containing one habit's values
+    per line.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    """
+
+    value_columns = {}
+
+    try:
+        with open(filename, "r") as file:
+            file_text = file.read()
+    except FileNotFoundError:
+        return value_columns
+
+    for line in file_text.splitlines():
+        column = json.loads(line)
+        value_columns[column["id"]] = HabitValueColumn(
+            current_date,
+            dt.datetime.strptime(column["start"], "%Y-%m-%d").toordinal(),
+            column["values"])
+
+    return value_columns
+
+
+def write_value_file(filename, value_columns):
+    """
+    Stores the values of the quantitative habits in a json file, one habit per line.
+
+    filename: (type str) The name of a file to be created or overwritten to
+    store the values.
+    value_columns: (type dict[str, HabitValueColumn]) The values of every
+    quantitative habit by habit id.
+    """
+
+    with open(filename, "w") as file:
+        for habit_id, column in value_columns.items():
+            file.write(json.dumps({
+                "id": habit_id,
+                "start": dt.date.fromordinal(column.start_ordinal).strftime("%Y-%m-%d"),
+                "values": column.values.tolist()
+            }))
+            file.write("\n")
+
+
+def merge_value_columns(disk_columns, value_columns):
+    """
+    Merges the values changed by another instance of the program into
+    value_columns. A day changed in the value file since it was last read is
+    taken unless it was also changed locally, in which case the local value wins.
+    Returns the ids of the habits whose values were changed.
+    return type: set[str]
+
+    disk_columns: (type dict[str, HabitValueColumn]) The values as they are now
+    in the value file.
+    value_columns: (type dict[str, HabitValueColumn]) The values of every
+    quantitative habit by habit id.
+    """
+
+    changed_habit_ids = set()
+
+    for habit_id, disk_column in disk_columns.items():
+        column = value_columns.setdefault(habit_id, HabitValueColumn(
+            dt.date.fromordinal(disk_column.today_ordinal)))
+
+        # Compare every day stored on disk now or when the file was last read
+        first_ordinal = min(disk_column.start_ordinal, column.saved_start_ordinal)
+        last_ordinal = max(disk_column.start_ordinal + len(disk_column.values),
+                           column.saved_start_ordinal + len(column.saved_values))
+
+        for ordinal in range(first_ordinal, last_ordinal):
+            saved_value = column.get_saved_value(ordinal)
+            disk_value = disk_column.get_value(ordinal)
+            if disk_value != saved_value and column.get_value(ordinal) == saved_value:
+                column.add_value(ordinal, disk_value - saved_value)
+                changed_habit_ids.add(habit_id)
+
+        # Later merges compare against the values now in the value file
+        column.mark_saved(disk_column)
+
+    return changed_habit_ids
+
+
+def read_streak_index(archive_dir):
+    """
+    Reads the index of the activity archive and returns it as a dictionary.
+    return type: dict
+
+    archive_dir: (type str) The name of the directory containing the archive
+    segments and the streak index.
+    """
+
+    streak_index = {
+        "archived_streak_days": 0,  # Days of the current streak stored in the archive
+        "sealed_through": None,  # Last day covered by the sealed segments
+        "detached_days": []  # Unsealed days of discarded streaks
+    }
+
+    # Attempt to read the index, keep the defaults if the archive is empty
+    try:
+        with open(os.path.join(archive_dir, STREAK_INDEX_FILE_NAME), "r") as file:
+            streak_index.update(json.load(file))
+    except FileNotFoundError:
+        pass
+
+    return streak_index
+
+
+def write_streak_index(archive_dir, streak_index):
+    """
+    Stores the index of the activity archive in a json file.
+
+    archive_dir: (type str) The name of the directory containing the archive
+    segments and the streak index.
+    streak_index: (type dict) The index of the activity archive.
+    """
+
+    os.makedirs(archive_dir, exist_ok=True)
+
+    with open(os.path.join(archive_dir, STREAK_INDEX_FILE_NAME), "w") as file:
+        json.dump(streak_index, file)
+
+
+def get_segment_file_name(archive_dir, period):
+    """
+    Returns the name of the archive segment storing the active days of a period.
+    return type: str
+
+    archive_dir: (type str) The name of the directory containing the archive segments.
+    period: (type str) A year as "YYYY" or a month as "YYYY-MM".
+    """
+
+    return os.path.join(archive_dir, f"activity-{period}.gz")
+
+
+def read_archive_segment(filename):
+    """
+    Reads a compressed archive segment and returns its active days as a list of
+    "YYYY-MM-DD" strings. Returns an empty list if the segment does not exist.
+    return type: list[str]
+
+    filename: (type str) The name of a compressed archive segment.
+    """
+
+    try:
+        with gzip.open(filename, "rt") as file:
+            file_text = file.read()
+    except FileNotFoundError:
+        return []
+
+    return file_text.splitlines()
+
+
+def write_archive_segment(filename, day_list):
+    """
+    Seals a list of active days into a compressed archive segment. The segment is
+    written to a temporary file first so a sealed segment is never left half
+    written.
+
+    filename: (type str) The name of the archive segment to be created.
+    day_list: (type list[str]) A list of active days as "YYYY-MM-DD" strings.
+    """
+
+    temp_filename = filename + ".tmp"
+
+    with gzip.open(temp_filename, "wt") as file:
+        for day in sorted(set(day_list)):
+            file.write(day)
+            file.write("\n")
+
+    os.replace(temp_filename, filename)
+
+
+def seal_streak_history(archive_dir, active_streak_list, streak_index, current_date):
+    """
+    Moves all active days before the current month out of active_streak_list and
+    into compressed archive segments. Finished months of the current year are
+    sealed into monthly segments, which are compacted into a single yearly segment
+    once the year is over. Only the current month stays in the streak file.
+
+    archive_dir: (type str) The name of the directory containing the archive segments.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    """
+
+    month_start = current_date.strftime("%Y-%m-01")
+    current_year = current_date.strftime("%Y")
+    sealed_through = streak_index["sealed_through"] or ""
+
+    # Collect days of finished months that have not been sealed yet
+    day_set = {day.strftime("%Y-%m-%d") for day in active_streak_list}
+    day_set.update(streak_index["detached_days"])
+    new_days = [day for day in day_set if sealed_through < day < month_start]
+
+    os.makedirs(archive_dir, exist_ok=True)
+
+    # Seal finished months of the current year into monthly segments
+    month_days = {}
+    for day in new_days:
+        if day[:4] == current_year:
+            month_days.setdefault(day[:7], []).append(day)
+
+    for month, day_list in month_days.items():
+        filename = get_segment_file_name(archive_dir, month)
+        write_archive_segment(filename, read_archive_segment(filename) + day_list)
+
+    # Compact every finished year into a single yearly segment
+    year_days = {}
+    for day in new_days:
+        if day[:4] < current_year:
+            year_days.setdefault(day[:4], []).append(day)
+
+    for segment in os.listdir(archive_dir):
+        if segment.startswith("activity-") and segment.endswith(".gz") and len(segment) == 19:
+            if segment[9:13] < current_year:
+                year_days.setdefault(segment[9:13], [])
+
+    for year, day_list in year_days.items():
+        month_segments = [get_segment_file_name(archive_dir, f"{year}-{month:02}") for month in range(1, 13)]
+        filename = get_segment_file_name(archive_dir, year)
+
+        for segment in month_segments:
+            day_list = day_list + read_archive_segment(segment)
+
+        write_archive_segment(filename, read_archive_segment(filename) + day_list)
+
+        for segment in month_segments:
+            if os.path.exists(segment):
+                os.remove(segment)
+
+    # Drop sealed days from active_streak_list, keeping the last active day
+    sealed_count = 0
+    while sealed_count < len(active_streak_list) - 1:
+        if active_streak_list[sealed_count].strftime("%Y-%m-%d") >= month_start:
+            break
+        sealed_count += 1
+
+    del active_streak_list[:sealed_count]
+
+    # Update the index to cover the newly sealed days
+    last_sealed_day = (dt.datetime.strptime(month_start, "%Y-%m-%d") - dt.timedelta(days=1)).strftime("%Y-%m-%d")
+    streak_index["archived_streak_days"] += sealed_count
+    streak_index["sealed_through"] = max(sealed_through, last_sealed_day)
+    streak_index["detached_days"] = [day for day in streak_index["detached_days"] if day >= month_start]
+
+
+def read_activity_history(archive_dir, year, active_streak_list, streak_index):
+    """
+    Returns every day the user was active in a year, decompressing only the
+    archive segments of that year.
+    return type: list[dt.datetime]
+
+    archive_dir: (type str) The name of the directory containing the archive segments.
+    year: (type int) The year of the requested history.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    """
+
+    # Read the yearly segment, or the monthly segments if the year is not over
+    day_set = set(read_archive_segment(get_segment_file_name(archive_dir, f"{year}")))
+    for month in range(1, 13):
+        day_set.update(read_archive_segment(get_segment_file_name(archive_dir, f"{year}-{month:02}")))
+
+    # Add the days that have not been sealed yet
+    day_set.update(day.strftime("%Y-%m-%d") for day in active_streak_list)
+    day_set.update(streak_index["detached_days"])
+
+    return [dt.datetime.strptime(day, "%Y-%m-%d") for day in sorted(day_set) if day[:4] == f"{year}"]
+
+
+def get_streak_length(active_streak_list, streak_index=None):
+    """
+    Returns the number of days in the current streak, including the days that
+    have already been sealed into the archive.
+    return type: int
+
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    """
+
+    if streak_index is None:
+        return len(active_streak_list)
+
+    return len(active_streak_list) + streak_index["archived_streak_days"]
+
+
+@contextlib.contextmanager
+def lock_data_files(filename, blocking=True):
+    """
+    Holds an advisory lock on a lock file while the data files are read or
+    written, so that two instances of the program never write them at once.
+    Raises BlockingIOError if blocking is False and another instance holds the lock.
+
+    filename: (type str) The name of the lock file shared by all instances.
+    blocking: (type bool) Whether to wait for another instance to release the lock.
+    """
+
+    with open(filename, "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            except OSError as error:
+                raise BlockingIOError(str(error))
+
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def get_file_signature(filename):
+    """
+    Returns the modification time and size of a file, or None if it does not exist.
+    return type: tuple[int, int]
+
+    filename: (type str) The name of the file.
+    """
+
+    try:
+        file_stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def get_data_file_signatures():
+    """
+    Returns the signatures of the habit file, the streak file and the value file.
+    return type: tuple
+    """
+
+    return (get_file_signature(HABIT_FILE_NAME), get_file_signature(STREAK_FILE_NAME), get_file_signature(VALUE_FILE_NAME))
+
+
+def merge_habit_lists(base_list, disk_list, habit_list):
+    """
+    Merges changes made to the habit file by another instance of the program into
+    habit_list. Habits are matched by id and merged field by field: a field that
+    was changed on disk replaces the local value unless it was also edited locally.
+    Returns the ids of the habits that were changed and whether habits were added,
+    removed, reordered or rescheduled.
+    return type: tuple[set[str], bool]
+
+    base_list: (type list[dict]) The habit list as it was last read from the habit file.
+    disk_list: (type list[dict]) The habit list as it is now in the habit file.
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    """
+
+    base_habits = {habit["id"]: habit for habit in base_list}
+    disk_habits = {habit["id"]: habit for habit in disk_list}
+    local_habits = {habit["id"]: habit for habit in habit_list}
+
+    changed_habit_ids = set()
+    structure_changed = False
+
+    for index, disk_habit in enumerate(disk_list):
+        habit_id = disk_habit["id"]
+        base_habit = base_habits.get(habit_id, {})
+        local_habit = local_habits.get(habit_id)
+
+        # Add habits created by the other instance, skip habits deleted locally
+        if local_habit is None:
+            if habit_id not in base_habits:
+                habit_list.insert(min(index, len(habit_list)), copy.deepcopy(disk_habit))
+                structure_changed = True
+            continue
+
+        # Take every field changed on disk that has not been edited locally
+        for key, value in disk_habit.items():
+            if value != base_habit.get(key) and local_habit.get(key) == base_habit.get(key):
+                local_habit[key] = copy.deepcopy(value)
+                changed_habit_ids.add(habit_id)
+                if key in ("weekdays", "recurrence", "kind", "group"):
+                    structure_changed = True
+
+    # Remove habits deleted by the other instance unless they were edited locally
+    for habit_id, base_habit in base_habits.items():
+        if habit_id not in disk_habits and local_habits.get(habit_id) == base_habit:
+            habit_list[:] = [habit for habit in habit_list if habit["id"] != habit_id]
+            structure_changed = True
+
+    # Take the order from disk unless the habits were reordered locally
+    current_ids = {habit["id"] for habit in habit_list}
+    local_order = [habit["id"] for habit in habit_list if habit["id"] in base_habits]
+    base_order = [habit_id for habit_id in base_habits if habit_id in current_ids]
+    if local_order == base_order:
+        disk_order = {habit["id"]: index for index, habit in enumerate(disk_list)}
+        old_order = [habit["id"] for habit in habit_list]
+        habit_list.sort(key=lambda habit: disk_order.get(habit["id"], len(disk_order)))
+        if [habit["id"] for habit in habit_list] != old_order:
+            structure_changed = True
+
+    return changed_habit_ids, structure_changed
+
+
+def merge_streak_lists(disk_streak_list, active_streak_list):
+    """
+    Adds the days of the current streak that were recorded by another instance of
+    the program to active_streak_list.
+
+    disk_streak_list: (type list[dt.datetime]) The active days as they are now in
+    the streak file.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    """
+
+    streak_start = active_streak_list[0].strftime("%Y-%m-%d")
+    day_set = {day.strftime("%Y-%m-%d") for day in active_streak_list}
+
+    for day in disk_streak_list:
+        if day.strftime("%Y-%m-%d") >= streak_start and day.strftime("%Y-%m-%d") not in day_set:
+            active_streak_list.append(day)
+            day_set.add(day.strftime("%Y-%m-%d"))
+
+    active_streak_list.sort()
+
+
+def make_habit(name, note, weekdays, highlight, recurrence=None, habit_id=None, kind="check", target=1, group=""):
+    """
+    Returns a new, unchecked habit dictionary.
+    return type: dict
+
+    name: (type str) The name of the habit.
+    note: (type str) The note shown below the name.
+    weekdays: (type list[str]) The weekdays the habit repeats on, e.g. ["Mon", "Thu"].
+    highlight: (type bool) Whether the habit is highlighted.
+    recurrence: (type dict) The recurrence rule of the habit, repeating on
+    weekdays if not given.
+    habit_id: (type str) The id of the habit, a new id is created if not given.
+    kind: (type str) "check" for a checkbox, "count" for a number of times or
+    "duration" for a number of minutes per day.
+    target: (type int) The count or minutes needed to complete the habit each day.
+    group: (type str) The name of the group the habit is shown in, "" for none.
+    """
+
+    return {
+        "id": habit_id or uuid.uuid4().hex,
+        "name": name,
+        "note": note,
+        "weekdays": weekdays,
+        "recurrence": recurrence or {"type": "weekdays", "weekdays": weekdays},
+        "highlight": highlight,
+        "kind": kind,
+        "target": target,
+        "group": group,
+        "checked": False
+    }
+
+
+def is_quantitative_habit(habit):
+    """
+    Returns whether a habit counts times or minutes instead of being checked.
+    Habits from older files are checked.
+    return type: bool
+
+    habit: (type dict) A dictionary containing an individual habit's information.
+    """
+
+    return habit.get("kind", "check") != "check"
+
+
+def get_recurrence_rule(habit):
+    """
+    Returns the recurrence rule of a habit. Habits without a rule repeat on the
+    weekdays selected for them.
+    return type: dict
+
+    habit: (type dict) A dictionary containing an individual habit's information.
+    """
+
+    return habit.get("recurrence") or {"type": "weekdays", "weekdays": habit["weekdays"]}
+
+
+def compile_recurrence_rule(rule):
+    """
+    Compiles a recurrence rule into day ordinals and bit masks that can be checked
+    without parsing dates. Raises ValueError if the rule has an unknown type or is
+    an interval rule without a start date.
+    return type: dict
+
+    rule: (type dict) The recurrence rule of a habit.
+    """
+
+    if rule["type"] not in CreateHabitFrame.RECURRENCE_TYPES.values():
+        raise ValueError(f"unknown recurrence type {rule['type']}")
+    # Intervals are counted from the start date, so they repeat on the same days
+    # whichever day they are checked from
+    if rule["type"] == "interval" and not rule.get("start"):
+        raise ValueError("interval rule has no start date")
+
+    compiled_rule = {
+        "type": rule["type"],
+        "start": None,  # First day ordinal the habit can be due on
+        "end": None,  # Last day ordinal the habit can be due on
+        "mask": 0,  # Bit mask of weekdays (Mon = bit 0) or days of the month
+        "every": 1,  # Number of days between occurrences of an interval rule
+        "times": 1  # Number of completions per week of a times_per_week rule
+    }
+
+    if rule.get("start"):
+        compiled_rule["start"] = dt.datetime.strptime(rule["start"], "%Y-%m-%d").toordinal()
+    if rule.get("end"):
+        compiled_rule["end"] = dt.datetime.strptime(rule["end"], "%Y-%m-%d").toordinal()
+
+    if rule["type"] == "weekdays":
+        for weekday in rule["weekdays"]:
+            compiled_rule["mask"] |= 1 << WEEKDAYS_MONDAY_FIRST.index(weekday)
+    elif rule["type"] == "month_days":
+        for day in rule["days"]:
+            compiled_rule["mask"] |= 1 << day
+    elif rule["type"] == "interval":
+        compiled_rule["every"] = max(1, rule["every"])
+    elif rule["type"] == "times_per_week":
+        compiled_rule["times"] = max(1, rule["times"])
+
+    return compiled_rule
+
+
+def get_next_occurrence(habit, ordinal):
+    """
+    Returns the first day on or after a day that a habit is due, or None if the
+    habit is never due again or its recurrence rule is invalid.
+    return type: int
+
+    habit: (type dict) A dictionary containing an individual habit's information.
+    ordinal: (type int) The day to start from as a date ordinal.
+    """
+
+    # Rules are only compiled again once they change
+    rule = get_recurrence_rule(habit)
+    cached_rule, compiled_rule = compiled_rules.get(habit["id"], (None, None))
+    if cached_rule != rule:
+        try:
+            compiled_rule = compile_recurrence_rule(rule)
+        except ValueError:
+            compiled_rule = None
+        compiled_rules[habit["id"]] = (copy.deepcopy(rule), compiled_rule)
+
+    if compiled_rule is None:
+        return None
+
+    if compiled_rule["start"] is not None:
+        ordinal = max(ordinal, compiled_rule["start"])
+
+    if compiled_rule["type"] == "weekdays":
+        if not compiled_rule["mask"]:
+            return None
+        # Day ordinal 1 is a Monday, so (ordinal - 1) % 7 is the weekday
+        while not compiled_rule["mask"] >> ((ordinal - 1) % 7) & 1:
+            ordinal += 1
+
+    elif compiled_rule["type"] == "month_days":
+        if not compiled_rule["mask"]:
+            return None
+        # Every day of the month occurs at least once in 62 days
+        for next_ordinal in range(ordinal, ordinal + 62):
+            if compiled_rule["mask"] >> dt.date.fromordinal(next_ordinal).day & 1:
+                ordinal = next_ordinal
+                break
+        else:
+            return None
+
+    elif compiled_rule["type"] == "interval":
+        ordinal += -(ordinal - compiled_rule["start"]) % compiled_rule["every"]
+
+    elif compiled_rule["type"] == "times_per_week":
+        # Skip the rest of a week once the habit has been completed often enough,
+        # unless it was completed on that day
+        week_checks = habit.get("week_checks")
+        if week_checks:
+            week_start = dt.datetime.strptime(week_checks["week"], "%Y-%m-%d").toordinal()
+            last_day = dt.datetime.strptime(week_checks["last_day"], "%Y-%m-%d").toordinal()
+            if week_start <= ordinal < week_start + 7 and week_checks["count"] >= compiled_rule["times"] and ordinal != last_day:
+                ordinal = week_start + 7
+
+    if compiled_rule["end"] is not None and ordinal > compiled_rule["end"]:
+        return None
+
+    return ordinal
+
+
+def add_active_day(active_streak_list, current_date):
+    """
+    Adds current_date to the active_streak_list, extending the streak.
+
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    """
+
+    if active_streak_list[-1].strftime("%Y-%m-%d") != current_date.strftime("%Y-%m-%d"):
+        active_streak_list.append(current_date)
+
+
+def check_habit(habit, checked, active_streak_list, current_date, extend_streak=True):
+    """
+    Sets whether a habit has been completed today. Adds current_date to the
+    active_streak_list, extending the streak, and counts the completion towards
+    the week of a times_per_week habit.
+
+    habit: (type dict) A dictionary containing an individual habit's information.
+    checked: (type bool) Whether the habit has been completed today.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    extend_streak: (type bool) Whether to extend the streak. Quantitative habits
+    only extend it once their target is reached.
+    """
+
+    if extend_streak:
+        add_active_day(active_streak_list, current_date)
+
+    if get_recurrence_rule(habit)["type"] == "times_per_week" and checked != habit["checked"]:
+        week_start = (current_date - dt.timedelta(days=current_date.weekday())).strftime("%Y-%m-%d")
+        week_checks = habit.get("week_checks")
+        if not week_checks or week_checks["week"] != week_start:
+            week_checks = {"week": week_start, "count": 0, "last_day": week_start}
+        week_checks["count"] += 1 if checked else -1
+        week_checks["last_day"] = current_date.strftime("%Y-%m-%d")
+        habit["week_checks"] = week_checks
+
+    habit["checked"] = checked
+
+
+def record_habit_value(habit, amount, value_columns, active_streak_list, current_date):
+    """
+    Adds an amount to today's value of a quantitative habit and checks the habit
+    if the value has reached its target, which also extends the streak.
+    Returns today's value.
+    return type: int
+
+    habit: (type dict) A dictionary containing an individual habit's information.
+    amount: (type int) The count or minutes to add, negative to remove.
+    value_columns: (type dict[str, HabitValueColumn]) The values of every
+    quantitative habit by habit id.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    """
+
+    column = value_columns.setdefault(habit["id"], HabitValueColumn(current_date))
+    value = column.add_value(current_date.toordinal(), amount)
+
+    reached_target = value >= habit["target"]
+    check_habit(habit, reached_target, active_streak_list, current_date, extend_streak=reached_target)
+
+    return value
+
+
+def uncheck_all_habits(habit_list):
+    """
+    Sets all habits to unchecked at the start of a new day.
+
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    """
+
+    for habit in habit_list:
+        habit["checked"] = False
+
+
+def manage_streak(active_streak_list, current_date, streak_index=None, habit_list=None):
+    """
+    Manages the current streak, resetting the streak if too many days have passed.
+    Days on which no habit was due do not count towards the grace period.
+
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    streak_index: (type dict) The index of the activity archive.
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    """
+
+    days_passed = current_date - active_streak_list[-1]
+    missed_days = (current_date.toordinal() - active_streak_list[-1].toordinal()) - 1
+
+    # Skip the days in between on which no habit was due
+    if habit_list and days_passed > dt.timedelta(days=GRACE_PERIOD) and missed_days <= 366:
+        first_ordinal = active_streak_list[-1].toordinal() + 1
+        due_days = sum(1 for ordinal in range(first_ordinal, first_ordinal + missed_days)
+                       if any(get_next_occurrence(habit, ordinal) == ordinal for habit in habit_list))
+        days_passed -= dt.timedelta(days=missed_days - due_days)
+
+    # Clear streak if the number of days passed is higher than the grace period
+    if days_passed > dt.timedelta(days=GRACE_PERIOD):
+        # Keep the unsealed days of the old streak so they can still be archived
+        if streak_index is not None:
+            sealed_through = streak_index["sealed_through"] or ""
+            for day in active_streak_list:
+                if day.strftime("%Y-%m-%d") > sealed_through:
+                    streak_index["detached_days"].append(day.strftime("%Y-%m-%d"))
+            streak_index["archived_streak_days"] = 0
+
+        active_streak_list.clear()
+        active_streak_list.append(current_date)
+
+
+def load_data_files(current_date, root=None):
+    """
+    Reads the habit file, the streak file, the archive index and the value file,
+    then resets the streak and the checkboxes as needed for current_date.
+    return type: tuple[list[dict], list[dt.datetime], dict, dict[str, HabitValueColumn], tuple]
+
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    root: (type tk.Tk) The root window of the program, used to show the tutorial.
+    """
+
+    with lock_data_files(LOCK_FILE_NAME):
+        with profile_span("read_habit_file"):
+            habit_list = read_habit_file(HABIT_FILE_NAME, root)
+        with profile_span("read_streak_file"):
+            active_streak_list = read_streak_file(STREAK_FILE_NAME, current_date)
+            streak_index = read_streak_index(ARCHIVE_DIR_NAME)
+        with profile_span("read_value_file"):
+            value_columns = read_value_file(VALUE_FILE_NAME, current_date)
+        file_signatures = get_data_file_signatures()
+
+    manage_streak(active_streak_list, current_date, streak_index, habit_list)
+
+    # Clear checkboxes if it's a new day
+    if active_streak_list[-1].strftime("%Y-%m-%d") != current_date.strftime("%Y-%m-%d"):
+        uncheck_all_habits(habit_list)
+
+    return habit_list, active_streak_list, streak_index, value_columns, file_signatures
+
+
+def save_data_files(habit_list, habit_snapshot, active_streak_list, streak_index, file_signatures, current_date, value_columns=None, blocking=True):
+    """
+    Writes the habit file, the streak file, the archive and, if given, the value
+    file, first merging in any changes another instance has written since the
+    files were last read. Returns the new habit snapshot and file signatures.
+    return type: tuple[list[dict], tuple]
+
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    habit_snapshot: (type list[dict]) The habit list as it was last read from
+    the habit file.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    file_signatures: (type tuple) The signatures of the data files when they
+    were last read.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    value_columns: (type dict[str, HabitValueColumn]) The values of every
+    quantitative habit by habit id.
+    blocking: (type bool) Whether to wait for another instance to release the
+    lock. If False, BlockingIOError is raised while the lock is held.
+    """
+
+    with lock_data_files(LOCK_FILE_NAME, blocking):
+        habit_signature, streak_signature, value_signature = get_data_file_signatures()
+
+        if habit_signature not in (None, file_signatures[0]):
+            merge_habit_lists(habit_snapshot, read_habit_file(HABIT_FILE_NAME), habit_list)
+        if streak_signature not in (None, file_signatures[1]):
+            merge_streak_lists(read_streak_file(STREAK_FILE_NAME, current_date), active_streak_list)
+        if value_columns is not None and value_signature not in (None, file_signatures[2]):
+            merge_value_columns(read_value_file(VALUE_FILE_NAME, current_date), value_columns)
+
+        with profile_span("write_habits_to_file", {"habits": len(habit_list)}):
+            write_habits_to_file(HABIT_FILE_NAME, habit_list)
+        with profile_span("seal_streak_history"):
+            seal_streak_history(ARCHIVE_DIR_NAME, active_streak_list, streak_index, current_date)
+        with profile_span("write_streak_file", {"days": len(active_streak_list)}):
+            write_streak_file(STREAK_FILE_NAME, active_streak_list)
+            write_streak_index(ARCHIVE_DIR_NAME, streak_index)
+        if value_columns is not None:
+            with profile_span("write_value_file", {"habits": len(value_columns)}):
+                write_value_file(VALUE_FILE_NAME, value_columns)
+                for column in value_columns.values():
+                    column.mark_saved()
+
+        return copy.deepcopy(habit_list), get_data_file_signatures()
+
+
+def read_sync_state(filename):
+    """
+    Reads the sync state of this replica from a json file. A new replica id is
+    created if the file does not exist.
+    return type: dict
+
+    filename: (type str) The name of the .json file containing the sync state.
+    """
+
+    sync_state = {
+        "replica_id": uuid.uuid4().hex,
+        "clock": 0,  # Lamport clock of the registers written by this replica
+        "seq": 0,  # Sequence number of the last delta sent by this replica
+        "seen": {},  # Sequence number of the last delta received from every other replica
+        "habits": {},  # Registers of every habit: {id: {field: [value, clock, replica_id]}}
+        "active_days": []  # Every day any replica was active
+    }
+
+    try:
+        with open(filename, "r") as file:
+            sync_state.update(json.load(file))
+    except FileNotFoundError:
+        pass
+
+    return sync_state
+
+
+def write_sync_state(filename, sync_state):
+    """
+    Stores the sync state of this replica in a json file.
+
+    filename: (type str) The name of a file to be created or overwritten to
+    store the sync state.
+    sync_state: (type dict) The sync state of this replica.
+    """
+
+    with open(filename, "w") as file:
+        json.dump(sync_state, file)
+
+
+def is_valid_sync_position(replica_id, seq):
+    """
+    Returns whether a replica id is a uuid hex string and a sequence number is a
+    positive integer, so both can safely be used as parts of a file path.
+    return type: bool
+
+    replica_id: (type object) The id of a replica.
+    seq: (type object) The sequence number of a delta.
+    """
+
+    return (isinstance(replica_id, str)
+            and re.fullmatch(REPLICA_ID_PATTERN, replica_id) is not None
+            and isinstance(seq, int)
+            and not isinstance(seq, bool)
+            and seq > 0)
+
+
+def set_sync_register(sync_state, delta, habit_id, field, value):
+    """
+    Writes a new value into a last-writer-wins register of a habit and adds the
+    register to the outgoing delta.
+
+    sync_state: (type dict) The sync state of this replica.
+    delta: (type dict) The outgoing delta.
+    habit_id: (type str) The id of the habit.
+    field: (type str) The name of the register.
+    value: (type object) The new value of the register.
+    """
+
+    sync_state["clock"] += 1
+    register = [value, sync_state["clock"], sync_state["replica_id"]]
+
+    sync_state["habits"].setdefault(habit_id, {})[field] = register
+    delta["habits"].setdefault(habit_id, {})[field] = register
+
+
+def get_unordered_indices(position_list):
+    """
+    Returns the indices of the positions that have to change for position_list to
+    be sorted, keeping the longest increasing run of positions in place.
+    return type: set[int]
+
+    position_list: (type list) A list of positions, None for habits without one.
+    """
+
+    # Find the longest increasing subsequence with patience sorting
+    tail_positions = []
+    tail_indices = []
+    previous_indices = [None] * len(position_list)
+
+    for index, position in enumerate(position_list):
+        if position is None:
+            continue
+
+        pile = bisect.bisect_left(tail_positions, position)
+        if pile > 0:
+            previous_indices[index] = tail_indices[pile - 1]
+
+        if pile == len(tail_positions):
+            tail_positions.append(position)
+            tail_indices.append(index)
+        else:
+            tail_positions[pile] = position
+            tail_indices[pile] = index
+
+    kept_indices = set()
+    index = tail_indices[-1] if tail_indices else None
+    while index is not None:
+        kept_indices.add(index)
+        index = previous_indices[index]
+
+    return set(range(len(position_list))) - kept_indices
+
+
+def record_local_changes(habit_list, active_streak_list, sync_state):
+    """
+    Compares habit_list and active_streak_list to the sync state and writes every
+    local change into the registers. Returns the delta of the changed registers.
+    return type: dict
+
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    sync_state: (type dict) The sync state of this replica.
+    """
+
+    delta = {"habits": {}, "active_days": []}
+    records = sync_state["habits"]
+
+    # Write changed fields and undelete habits that exist locally
+    for habit in habit_list:
+        record = records.get(habit["id"], {})
+
+        for field, value in habit.items():
+            if field == "id" or field in LOCAL_HABIT_FIELDS:
+                continue
+            if field not in record or record[field][0] != value:
+                set_sync_register(sync_state, delta, habit["id"], field, value)
+
+        if record.get("deleted", [False])[0]:
+            set_sync_register(sync_state, delta, habit["id"], "deleted", False)
+
+    # Delete habits that no longer exist locally
+    habit_ids = {habit["id"] for habit in habit_list}
+    for habit_id, record in records.items():
+        if habit_id not in habit_ids and not record.get("deleted", [False])[0]:
+            set_sync_register(sync_state, delta, habit_id, "deleted", True)
+
+    # Give new positions only to the habits that are out of order
+    position_list = [records[habit["id"]].get("position", [None])[0] for habit in habit_list]
+    unordered_indices = get_unordered_indices(position_list)
+    for index in sorted(unordered_indices):
+        previous_position = position_list[index - 1] if index > 0 else None
+        next_position = None
+        for next_index in range(index + 1, len(position_list)):
+            if next_index not in unordered_indices:
+                next_position = position_list[next_index]
+                break
+
+        if previous_position is None and next_position is None:
+            position = 0.0
+        elif previous_position is None:
+            position = next_position - 1.0
+        elif next_position is None:
+            position = previous_position + 1.0
+        else:
+            position = (previous_position + next_position) / 2
+
+        position_list[index] = position
+        set_sync_register(sync_state, delta, habit_list[index]["id"], "position", position)
+
+    # Add new active days to the grow-only set
+    day_set = set(sync_state["active_days"])
+    for day in active_streak_list:
+        if day.strftime("%Y-%m-%d") not in day_set:
+            day_set.add(day.strftime("%Y-%m-%d"))
+            delta["active_days"].append(day.strftime("%Y-%m-%d"))
+
+    sync_state["active_days"] = sorted(day_set)
+
+    return delta
+
+
+def apply_sync_delta(sync_state, delta):
+    """
+    Merges a delta from another replica into the sync state. Registers keep the
+    value with the highest clock, ties broken by replica id, and active days are
+    united, so replicas merge to the same state in any order.
+
+    sync_state: (type dict) The sync state of this replica.
+    delta: (type dict) A delta received from another replica.
+    """
+
+    for habit_id, registers in delta["habits"].items():
+        record = sync_state["habits"].setdefault(habit_id, {})
+
+        for field, register in registers.items():
+            if field not in record or register[1:] > record[field][1:]:
+                record[field] = register
+            sync_state["clock"] = max(sync_state["clock"], register[1])
+
+    sync_state["active_days"] = sorted(set(sync_state["active_days"]) | set(delta["active_days"]))
+
+
+def materialize_sync_state(sync_state, habit_list, active_streak_list):
+    """
+    Rebuilds habit_list from the registers of the sync state, ordered by position,
+    and adds the synced active days of the current streak to active_streak_list.
+    Whether a habit was checked today is kept from the local habit.
+
+    sync_state: (type dict) The sync state of this replica.
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    """
+
+    local_habits = {habit["id"]: habit for habit in habit_list}
+    live_records = []
+
+    for habit_id, record in sync_state["habits"].items():
+        if not record.get("deleted", [False])[0]:
+            live_records.append((record.get("position", [0.0])[0], habit_id, record))
+
+    # Update existing habit dictionaries in place so references to them stay valid
+    habit_list.clear()
+    for position, habit_id, record in sorted(live_records):
+        habit = local_habits.get(habit_id, {"checked": False})
+        local_fields = {field: habit[field] for field in LOCAL_HABIT_FIELDS if field in habit}
+        habit.clear()
+        habit["id"] = habit_id
+        for field, register in record.items():
+            if field not in ("position", "deleted") + LOCAL_HABIT_FIELDS:
+                habit[field] = copy.deepcopy(register[0])
+        habit.update(local_fields)
+        habit_list.append(habit)
+
+    merge_streak_lists([dt.datetime.strptime(day, "%Y-%m-%d") for day in sync_state["active_days"]],
+                       active_streak_list)
+
+
+def sync_habits(habit_list, active_streak_list, sync_state, transport):
+    """
+    Sends the local changes to the other replicas as a delta, merges the deltas
+    they have sent and updates habit_list and active_streak_list with the result.
+
+    habit_list: (type list[dict]) A list of dictionaries containing habit information.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    sync_state: (type dict) The sync state of this replica.
+    transport: (type DirectorySyncTransport or HttpSyncTransport) The transport
+    used to exchange deltas.
+    """
+
+    # Record the changes on a copy, so sync_state is left unchanged if the push fails
+    sent_sync_state = copy.deepcopy(sync_state)
+    delta = record_local_changes(habit_list, active_streak_list, sent_sync_state)
+
+    # Only send a delta if something changed
+    if delta["habits"] or delta["active_days"]:
+        sent_sync_state["seq"] += 1
+        transport.push(sent_sync_state["replica_id"], sent_sync_state["seq"], delta)
+
+    sync_state.update(sent_sync_state)
+
+    for replica_id, seq, other_delta in transport.pull(sync_state["replica_id"], sync_state["seen"]):
+        apply_sync_delta(sync_state, other_delta)
+        sync_state["seen"][replica_id] = max(seq, sync_state["seen"].get(replica_id, 0))
+
+    materialize_sync_state(sync_state, habit_list, active_streak_list)
+
+
+class ProfileSpan:
+    """
+    A context manager that records the time spent in a block of code as a
+    Chrome trace event.
+    """
+
+    def __init__(self, name, args=None):
+        """
+        ProfileSpan constructor.
+
+        name: (type str) The name of the span shown in the trace.
+        args: (type dict) Extra information shown with the span.
+        """
+
+        self.name = name
+        self.args = args or {}
+
+    def __enter__(self):
+        self.start_time = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end_time = time.perf_counter_ns()
+        profile_events.append({
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start_time / 1000,
+            "dur": (end_time - self.start_time) / 1000,
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": self.args
+        })
+
+
+NULL_PROFILE_SPAN = contextlib.nullcontext()  # Returned by profile_span while profiling is disabled
+
+
+def enable_profiling():
+    """
+    Starts recording profiling spans.
+    """
+
+    global profile_events
+    profile_events = []
+
+
+def profile_span(name, args=None):
+    """
+    Returns a context manager timing a block of code as a span of the profiling
+    trace. Does nothing while profiling is disabled.
+    return type: ProfileSpan or contextlib.nullcontext
+
+    name: (type str) The name of the span shown in the trace.
+    args: (type dict) Extra information shown with the span.
+    """
+
+    if profile_events is None:
+        return NULL_PROFILE_SPAN
+
+    return ProfileSpan(name, args)
+
+
+def record_profile_counter(name, values):
+    """
+    Records the values of a counter in the profiling trace.
+
+    name: (type str) The name of the counter shown in the trace.
+    values: (type dict) The values of the counter.
+    """
+
+    if profile_events is None:
+        return
+
+    profile_events.append({
+        "name": name,
+        "ph": "C",
+        "ts": time.perf_counter_ns() / 1000,
+        "pid": os.getpid(),
+        "tid": 0,
+        "args": values
+    })
+
+
+def count_widgets(widget):
+    """
+    Returns the number of widgets in a widget tree, including the widget itself.
+    return type: int
+
+    widget: (type tk.Widget) The root of the widget tree.
+    """
+
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def write_profile_trace(filename):
+    """
+    Stores the recorded profiling spans in a Chrome trace-event json file, which
+    can be opened in chrome://tracing or Perfetto.
+
+    filename: (type str) The name of a file to be created or overwritten to
+    store the trace.
+    """
+
+    with open(filename, "w") as file:
+        json.dump({"traceEvents": profile_events, "displayTimeUnit": "ms"}, file)
+
+
+def get_profile_summary():
+    """
+    Returns a table of the count, total, mean and maximum duration of every
+    recorded span.
+    return type: str
+    """
+
+    span_durations = {}
+    for event in profile_events:
+        if event["ph"] == "X":
+            span_durations.setdefault(event["name"], []).append(event["dur"] / 1000)
+
+    lines = [f"{'Span':<32}{'Count':>7}{'Total ms':>12}{'Mean ms':>12}{'Max ms':>12}"]
+    for name, durations in sorted(span_durations.items(), key=lambda item: -sum(item[1])):
+        lines.append(f"{name:<32}{len(durations):>7}{sum(durations):>12.2f}"
+                     f"{sum(durations) / len(durations):>12.2f}{max(durations):>12.2f}")
+
+    return "\n".join(lines)
+
+
+def get_image_file(active_streak_list, streak_index=None):
+    """
+    Returns the name of an image file to be displayed in MainWindow according to
+    current streak length.
+
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    """
+
+    streak_length = get_streak_length(active_streak_list, streak_index)
+
+    # Select a plant image to return based on streak_length
+    if streak_length <= 1:
+        return "plant1.png"
+    elif streak_length <= 3:
+        return "plant2.png"
+    elif streak_length <= 7:
+        return "plant3.png"
+    elif streak_length <= 13:
+        return "plant4.png"
+    elif streak_length <= 25:
+        return "plant5.png"
+    elif streak_length <= 39:
+        return "plant6.png"
+    else:
+        return "plant7.png"
+
+
+def request_daemon(method, path, data=None, host=DAEMON_HOST, port=DAEMON_PORT):
+    """
+    Sends a request to a running HabitDaemon and returns the HTTP status and the
+    decoded JSON response.
+    return type: tuple[int, object]
+
+    method: (type str) The HTTP method of the request.
+    path: (type str) The path of the request, e.g. "/habits/today".
+    data: (type dict) The JSON body of the request.
+    host: (type str) The address the daemon listens on.
+    port: (type int) The port the daemon listens on.
+    """
+
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+
+    try:
+        body = json.dumps(data) if data is not None else None
+        connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def run_daemon(port):
+    """
+    Runs the HabitDaemon until it is interrupted.
+
+    port: (type int) The port the daemon listens on.
+    """
+
+    try:
+        asyncio.run(HabitDaemon(port=port).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def read_import_rows(filename):
+    """
+    Yields the rows of a csv or json lines import file one at a time, with their
+    line numbers. Rows that are not valid json are yielded as None.
+    return type: generator[tuple[int, dict]]
+
+    filename: (type str) The name of a .csv file, or a file containing one json
+    object per line.
+    """
+
+    with open(filename, "r", newline="") as file:
+        if filename.lower().endswith(".csv"):
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, None
+
+
+def validate_recurrence_rule(rule):
+    """
+    Checks a recurrence rule the same way the habit creation window checks an
+    entered rule. Raises ValueError if the rule is invalid.
+
+    rule: (type dict) The recurrence rule of a habit.
+    """
+
+    if not isinstance(rule, dict) or rule.get("type") not in CreateHabitFrame.RECURRENCE_TYPES.values():
+        raise ValueError("unknown recurrence type")
+
+    if rule["type"] == "weekdays":
+        weekdays = rule.get("weekdays")
+        if not isinstance(weekdays, list) or not all(weekday in WEEKDAYS_MONDAY_FIRST for weekday in weekdays):
+            raise ValueError("recurrence weekdays must be a list of weekdays")
+    elif rule["type"] == "month_days":
+        days = rule.get("days")
+        if not isinstance(days, list) or not all(isinstance(day, int) and 1 <= day <= 31 for day in days):
+            raise ValueError("recurrence days of the month must be between 1 and 31")
+    else:
+        key = "every" if rule["type"] == "interval" else "times"
+        if not isinstance(rule.get(key), int) or rule[key] < 1:
+            raise ValueError(f"recurrence {key} must be at least 1")
+
+    for key in ("start", "end"):
+        if rule.get(key):
+            try:
+                dt.datetime.strptime(str(rule[key]), "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"recurrence {key} date must be YYYY-MM-DD")
+
+    if rule["type"] == "interval" and not rule.get("start"):
+        raise ValueError("recurrence interval has no start date")
+
+
+def parse_import_habit(row):
+    """
+    Validates a habit row of an import file and returns it as a habit dictionary.
+    Raises ValueError if the row is invalid.
+    return type: dict
+
+    row: (type dict) A row of an import file. Values may be strings, as in csv files.
+    """
+
+    name = str(row.get("name") or "").strip()
+    note = str(row.get("note") or "").strip()
+
+    if not name:
+        raise ValueError("habit has no name")
+    if len(name) > CreateHabitFrame.NAME_CHARACTER_LIMIT:
+        raise ValueError(f"name is longer than {CreateHabitFrame.NAME_CHARACTER_LIMIT} characters")
+    if len(note) > CreateHabitFrame.NOTE_CHARACTER_LIMIT:
+        raise ValueError(f"note is longer than {CreateHabitFrame.NOTE_CHARACTER_LIMIT} characters")
+
+    # Weekdays are a list in json files and separated by semicolons in csv files
+    weekdays = row.get("weekdays") or WeekdaySelectFrame.WEEKDAYS_STR
+    if isinstance(weekdays, str):
+        weekdays = [weekday.strip() for weekday in weekdays.split(";") if weekday.strip()]
+    for weekday in weekdays:
+        if weekday not in WeekdaySelectFrame.WEEKDAYS_STR:
+            raise ValueError(f"unknown weekday {weekday}")
+
+    highlight = row.get("highlight") or False
+    if isinstance(highlight, str):
+        highlight = highlight.strip().lower() in ("true", "1", "yes")
+
+    # Recurrence rules are json objects, stored as text in csv files
+    recurrence = row.get("recurrence") or None
+    if isinstance(recurrence, str):
+        recurrence = json.loads(recurrence)
+    if recurrence:
+        validate_recurrence_rule(recurrence)
+
+    kind = row.get("kind") or "check"
+    if kind not in CreateHabitFrame.HABIT_KINDS.values():
+        raise ValueError(f"unknown habit kind {kind}")
+    target = int(row.get("target") or 1)
+    if target < 1:
+        raise ValueError("target must be at least 1")
+
+    group = str(row.get("group") or "").strip()
+    if len(group) > CreateHabitFrame.GROUP_CHARACTER_LIMIT:
+        raise ValueError(f"group is longer than {CreateHabitFrame.GROUP_CHARACTER_LIMIT} characters")
+
+    return make_habit(name, note, list(weekdays), bool(highlight), recurrence, row.get("id") or None, kind, target, group)
+
+
+def write_activity_batch(archive_dir, day_set, active_streak_list, streak_index, current_date):
+    """
+    Writes a batch of imported active days. Days before the current month are
+    merged into the archive segments they belong to, and days of the current
+    month are added to active_streak_list. Days of the current month before the
+    current streak began are kept as detached days of the streak index, which
+    are archived with the month.
+
+    archive_dir: (type str) The name of the directory containing the archive segments.
+    day_set: (type set[str]) A set of active days as "YYYY-MM-DD" strings.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    current_date: (type dt.datetime) The current date as a dt.datetime object.
+    """
+
+    month_start = current_date.strftime("%Y-%m-01")
+    current_year = current_date.strftime("%Y")
+
+    # Group the days by the segment they belong to
+    segment_days = {}
+    for day in day_set:
+        if day < month_start:
+            period = day[:4] if day[:4] < current_year else day[:7]
+            segment_days.setdefault(period, []).append(day)
+
+    with lock_data_files(LOCK_FILE_NAME):
+        os.makedirs(archive_dir, exist_ok=True)
+        for period, day_list in segment_days.items():
+            filename = get_segment_file_name(archive_dir, period)
+            write_archive_segment(filename, read_archive_segment(filename) + day_list)
+
+    streak_start = active_streak_list[0].strftime("%Y-%m-%d")
+    detached_days = set(streak_index["detached_days"])
+    for day in day_set:
+        if month_start <= day < streak_start and day not in detached_days:
+            streak_index["detached_days"].append(day)
+            detached_days.add(day)
+
+    merge_streak_lists([dt.datetime.strptime(day, "%Y-%m-%d") for day in day_set if day >= month_start],
+                       active_streak_list)
+
+
+def run_import(filename):
+    """
+    Imports habits, check-ins and values of quantitative habits from a csv or
+    json lines file, one row at a time. Habits are matched to existing habits by
+    id, then by name, and check-ins are written to the activity history in
+    batches. Invalid rows are skipped and reported.
+
+    filename: (type str) The name of the import file.
+    """
+
+    current_date = dt.datetime.today()
+    habit_list, active_streak_list, streak_index, value_columns, file_signatures = load_data_files(current_date)
+    habit_snapshot = copy.deepcopy(habit_list)
+
+    habits_by_id = {habit["id"]: habit for habit in habit_list}
+    habits_by_name = {habit["name"]: habit for habit in habit_list}
+    day_set = set()
+    habit_count = 0
+    check_in_count = 0
+    value_count = 0
+    error_list = []
+    error_count = 0
+
+    for line_number, row in read_import_rows(filename):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("row is not a json object")
+
+            row_type = row.get("type") or ("checkin" if row.get("date") else "habit")
+
+            if row_type == "habit":
+                habit = parse_import_habit(row)
+                existing_habit = habits_by_id.get(habit["id"]) or habits_by_name.get(habit["name"])
+
+                # Update existing habits in place, keeping their id and check state
+                if existing_habit:
+                    for key, value in habit.items():
+                        if key not in ("id", "checked"):
+                            existing_habit[key] = value
+                else:
+                    habit_list.append(habit)
+                    habits_by_id[habit["id"]] = habit
+                    habits_by_name[habit["name"]] = habit
+
+                habit_count += 1
+
+            elif row_type == "checkin":
+                day_set.add(dt.datetime.strptime(str(row["date"])[:10], "%Y-%m-%d").strftime("%Y-%m-%d"))
+                check_in_count += 1
+
+                # Write check-ins in batches to keep memory bounded
+                if len(day_set) >= IMPORT_BATCH_SIZE:
+                    write_activity_batch(ARCHIVE_DIR_NAME, day_set, active_streak_list, streak_index, current_date)
+                    day_set.clear()
+
+            elif row_type == "value":
+                habit = habits_by_id.get(row.get("id")) or habits_by_name.get(row.get("name"))
+                if not habit or not is_quantitative_habit(habit):
+                    raise ValueError("value row does not belong to a count or duration habit")
+
+                # Imported values replace the value of their day
+                ordinal = dt.datetime.strptime(str(row["date"])[:10], "%Y-%m-%d").toordinal()
+                column = value_columns.setdefault(habit["id"], HabitValueColumn(current_date))
+                column.add_value(ordinal, int(row["value"]) - column.get_value(ordinal))
+                value_count += 1
+
+            else:
+                raise ValueError(f"unknown row type {row_type}")
+
+        except (ValueError, KeyError, TypeError) as error:
+            error_count += 1
+            if len(error_list) < IMPORT_ERROR_LIMIT:
+                error_list.append(f"line {line_number}: {error}")
+
+    write_activity_batch(ARCHIVE_DIR_NAME, day_set, active_streak_list, streak_index, current_date)
+    save_data_files(habit_list, habit_snapshot, active_streak_list, streak_index, file_signatures, current_date, value_columns)
+
+    print(f"Imported {habit_count} habits, {check_in_count} check-ins and {value_count} values, skipped {error_count} invalid rows")
+    for error in error_list:
+        print(error, file=sys.stderr)
+
+
+def get_activity_years(archive_dir, active_streak_list, streak_index):
+    """
+    Returns every year with active days in the archive or the streak file.
+    return type: list[int]
+
+    archive_dir: (type str) The name of the directory containing the archive segments.
+    active_streak_list: (type list[dt.datetime]) A list of all days the user
+    was active in their current streak.
+    streak_index: (type dict) The index of the activity archive.
+    """
+
+    year_set = {day.year for day in active_streak_list}
+    year_set.update(int(day[:4]) for day in streak_index["detached_days"])
+
+    if os.path.isdir(archive_dir):
+        for segment in os.listdir(archive_dir):
+            if segment.startswith("activity-") and segment.endswith(".gz"):
+                year_set.add(int(segment[9:13]))
+
+    return sorted(year_set)
+
+
+def run_export(filename):
+    """
+    Exports every habit, active day and value of a quantitative habit to a csv
+    or json lines file, writing one row at a time and reading the archive one
+    year at a time.
+
+    filename: (type str) The name of a .csv file, or of a file to store one json
+    object per line.
+    """
+
+    current_date = dt.datetime.today()
+    habit_list, active_streak_list, streak_index, value_columns, file_signatures = load_data_files(current_date)
+
+    with open(filename, "w", newline="") as file:
+        if filename.lower().endswith(".csv"):
+            writer = csv.DictWriter(file, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+
+            for habit in habit_list:
+                writer.writerow({
+                    "type": "habit",
+                    "id": habit["id"],
+                    "name": habit["name"],
+                    "note": habit["note"],
+                    "weekdays": ";".join(habit["weekdays"]),
+                    "highlight": str(habit["highlight"]).lower(),
+                    "recurrence": json.dumps(get_recurrence_rule(habit)),
+                    "kind": habit.get("kind", "check"),
+                    "target": habit.get("target", 1),
+                    "group": habit.get("group", "")
+                })
+        else:
+            writer = None
+
+            for habit in habit_list:
+                file.write(json.dumps({"type": "habit", **habit}))
+                file.write("\n")
+
+        for year in get_activity_years(ARCHIVE_DIR_NAME, active_streak_list, streak_index):
+            for day in read_activity_history(ARCHIVE_DIR_NAME, year, active_streak_list, streak_index):
+                if writer:
+                    writer.writerow({"type": "checkin", "date": day.strftime("%Y-%m-%d")})
+                else:
+                    file.write(json.dumps({"type": "checkin", "date": day.strftime("%Y-%m-%d")}))
+                    file.write("\n")
+
+        # Write every day with a value, skipping the days without one
+        for habit_id, column in value_columns.items():
+            for index, value in enumerate(column.values):
+                if value:
+                    row = {
+                        "type": "value",
+                        "id": habit_id,
+                        "date": dt.date.fromordinal(column.start_ordinal + index).strftime("%Y-%m-%d"),
+                        "value": value
+                    }
+                    if writer:
+                        writer.writerow(row)
+                    else:
+                        file.write(json.dumps(row))
+                        file.write("\n")
+
+
+def run_sync(target):
+    """
+    Syncs the habits and active days with other replicas once.
+
+    target: (type str) A shared directory, or the "http://host:port" address of
+    a HabitDaemon standing in for a sync server.
+    """
+
+    current_date = dt.datetime.today()
+
+    if target.startswith("http://"):
+        address = urllib.parse.urlsplit(target)
+        transport = HttpSyncTransport(address.hostname, address.port or DAEMON_PORT)
+    else:
+        transport = DirectorySyncTransport(target)
+
+    habit_list, active_streak_list, streak_index, value_columns, file_signatures = load_data_files(current_date)
+    habit_snapshot = copy.deepcopy(habit_list)
+    sync_state = read_sync_state(SYNC_STATE_FILE_NAME)
+
+    sync_habits(habit_list, active_streak_list, sync_state, transport)
+
+    save_data_files(habit_list, habit_snapshot, active_streak_list, streak_index, file_signatures, current_date, value_columns)
+    write_sync_state(SYNC_STATE_FILE_NAME, sync_state)
+
+
+def parse_arguments():
+    """
+    Returns the command line arguments of the program.
+    return type: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(description="Just Habits")
+    parser.add_argument("--daemon",
+                        action="store_true",
+                        help="run as a local JSON/HTTP daemon instead of opening the window")
+    parser.add_argument("--port",
+                        type=int,
+                        default=DAEMON_PORT,
+                        help="the port the daemon listens on")
+    parser.add_argument("--sync",
+                        metavar="TARGET",
+                        help="sync once with a shared directory or a daemon at http://host:port, then exit")
+    parser.add_argument("--import",
+                        dest="import_file",
+                        metavar="FILE",
+                        help="import habits and check-ins from a csv or json lines FILE, then exit")
+    parser.add_argument("--export",
+                        dest="export_file",
+                        metavar="FILE",
+                        help="export habits and check-ins to a csv or json lines FILE, then exit")
+    parser.add_argument("--profile",
+                        metavar="FILE",
+                        default=os.environ.get(PROFILE_ENV_VAR),
+                        help=f"write a Chrome trace of the hot paths to FILE (or set {PROFILE_ENV_VAR})")
+
+    return parser.parse_args()
+
+
+def run_window():
+    """
+    Opens the main window and writes the habits and streak to file once it is
+    closed.
+    """
+
+    current_date = dt.datetime.today()
+
+    # Configure root window
+    root = tk.Tk()
+    root.resizable(False, False)
+    root.title("Just Habits")
+
+    # Configure habit_list and active_streak_list
+    habit_list, active_streak_list, streak_index, value_columns, file_signatures = load_data_files(current_date, root)
+    habit_snapshot = copy.deepcopy(habit_list)
+
+    plant_image_file = get_image_file(active_streak_list, streak_index)
+
+    with profile_span("MainWindow"):
+        content_frame = MainWindow(parent=root,
+                                   image_file=plant_image_file,
+                                   habit_list=habit_list,
+                                   current_date=current_date,
+                                   active_streak_list=active_streak_list,
+                                   streak_index=streak_index,
+                                   habit_snapshot=habit_snapshot,
+                                   file_signatures=file_signatures,
+                                   value_columns=value_columns)
+
+    content_frame.grid(column=0, row=0)
+
+    root.mainloop()
+
+    # Write habits and streak to file after root window is closed
+    save_data_files(habit_list,
+                    content_frame.habit_snapshot,
+                    active_streak_list,
+                    streak_index,
+                    content_frame.file_signatures,
+                    current_date,
+                    value_columns)
+
+
+def main():
+
+    arguments = parse_arguments()
+
+    if arguments.profile:
+        enable_profiling()
+
+    try:
+        if arguments.daemon:
+            run_daemon(arguments.port)
+        elif arguments.sync:
+            run_sync(arguments.sync)
+        elif arguments.import_file:
+            run_import(arguments.import_file)
+        elif arguments.export_file:
+            run_export(arguments.export_file)
+        else:
+            run_window()
+    finally:
+        # Write the profiling trace and summary once the program is done
+        if arguments.profile:
+            write_profile_trace(arguments.profile)
+            print(get_profile_summary())
 
 
 if __name__ == "__main__":
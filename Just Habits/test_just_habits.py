@@ -0,0 +1,742 @@
+"""
+Tests for the data logic of the Just Habits program
+Run with: python -m unittest test_just_habits
+"""
+
+import asyncio
+import contextlib
+import copy
+import datetime as dt
+import io
+import json
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+import just_habits_release_ver as jh
+
+
+def make_test_habit(name, habit_id=None, recurrence=None):
+    """
+    Returns a habit due every Monday, as stored in the habit file.
+    return type: dict
+
+    name: (type str) The name of the habit, also its id if habit_id is not given.
+    habit_id: (type str) The id of the habit.
+    recurrence: (type dict) The recurrence rule of the habit.
+    """
+
+    habit = {"id": habit_id or name, "name": name, "note": "", "weekdays": ["Mon"], "highlight": False, "checked": False}
+    if recurrence:
+        habit["recurrence"] = recurrence
+
+    return habit
+
+
+def make_sync_state(replica_id):
+    """
+    Returns an empty sync state of a replica.
+    return type: dict
+
+    replica_id: (type str) The id of the replica.
+    """
+
+    return {"replica_id": replica_id, "clock": 0, "seq": 0, "seen": {}, "habits": {}, "active_days": []}
+
+
+class ArchiveSealingTests(unittest.TestCase):
+    """
+    Tests that sealing the activity history into archive segments keeps every active day.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.archive_dir = os.path.join(self.temp_dir.name, jh.ARCHIVE_DIR_NAME)
+        self.streak_index = jh.read_streak_index(self.archive_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_streak(self, first_day, last_day):
+        return [first_day + dt.timedelta(days=days) for days in range((last_day - first_day).days + 1)]
+
+    def read_history(self, active_streak_list, year):
+        return jh.read_activity_history(self.archive_dir, year, active_streak_list, self.streak_index)
+
+    def test_seals_finished_months(self):
+        active_streak_list = self.make_streak(dt.datetime(2025, 11, 20), dt.datetime(2026, 2, 10))
+        all_days = list(active_streak_list)
+
+        jh.seal_streak_history(self.archive_dir, active_streak_list, self.streak_index, dt.datetime(2026, 2, 10))
+
+        # Only the current month stays in the streak list
+        self.assertEqual(active_streak_list, all_days[-10:])
+        self.assertEqual(jh.get_streak_length(active_streak_list, self.streak_index), len(all_days))
+        self.assertEqual(self.streak_index["sealed_through"], "2026-01-31")
+        self.assertEqual(sorted(os.listdir(self.archive_dir)), ["activity-2025.gz", "activity-2026-01.gz"])
+
+        self.assertEqual(self.read_history(active_streak_list, 2025), [day for day in all_days if day.year == 2025])
+        self.assertEqual(self.read_history(active_streak_list, 2026), [day for day in all_days if day.year == 2026])
+
+    def test_compacts_months_once_the_year_is_over(self):
+        active_streak_list = self.make_streak(dt.datetime(2025, 10, 25), dt.datetime(2025, 12, 15))
+        jh.seal_streak_history(self.archive_dir, active_streak_list, self.streak_index, dt.datetime(2025, 12, 15))
+
+        self.assertEqual(sorted(os.listdir(self.archive_dir)), ["activity-2025-10.gz", "activity-2025-11.gz"])
+
+        active_streak_list.extend(self.make_streak(dt.datetime(2025, 12, 16), dt.datetime(2026, 1, 5)))
+        jh.seal_streak_history(self.archive_dir, active_streak_list, self.streak_index, dt.datetime(2026, 1, 5))
+
+        self.assertEqual(os.listdir(self.archive_dir), ["activity-2025.gz"])
+        self.assertEqual(self.read_history(active_streak_list, 2025),
+                         self.make_streak(dt.datetime(2025, 10, 25), dt.datetime(2025, 12, 31)))
+        self.assertEqual(jh.get_streak_length(active_streak_list, self.streak_index), 73)
+
+    def test_archives_days_of_a_reset_streak(self):
+        active_streak_list = self.make_streak(dt.datetime(2026, 1, 10), dt.datetime(2026, 1, 20))
+        old_days = list(active_streak_list)
+
+        jh.manage_streak(active_streak_list, dt.datetime(2026, 2, 10), self.streak_index)
+        jh.seal_streak_history(self.archive_dir, active_streak_list, self.streak_index, dt.datetime(2026, 2, 10))
+
+        self.assertEqual(active_streak_list, [dt.datetime(2026, 2, 10)])
+        self.assertEqual(self.streak_index["detached_days"], [])
+        self.assertEqual(jh.get_streak_length(active_streak_list, self.streak_index), 1)
+        self.assertEqual(self.read_history(active_streak_list, 2026), old_days + [dt.datetime(2026, 2, 10)])
+
+
+class MergeHabitListTests(unittest.TestCase):
+    """
+    Tests merge_habit_lists.
+    """
+
+    def setUp(self):
+        self.base_list = [make_test_habit(name) for name in ("a", "b", "c")]
+        self.habit_list = copy.deepcopy(self.base_list)
+        self.disk_list = copy.deepcopy(self.base_list)
+
+    def merge(self):
+        return jh.merge_habit_lists(self.base_list, self.disk_list, self.habit_list)
+
+    def test_takes_disk_changes(self):
+        self.disk_list[0]["note"] = "disk"
+
+        changed_habit_ids, structure_changed = self.merge()
+
+        self.assertEqual(self.habit_list[0]["note"], "disk")
+        self.assertEqual(changed_habit_ids, {"a"})
+        self.assertFalse(structure_changed)
+
+    def test_local_edit_wins(self):
+        self.disk_list[0]["note"] = "disk"
+        self.habit_list[0]["note"] = "local"
+
+        self.merge()
+
+        self.assertEqual(self.habit_list[0]["note"], "local")
+
+    def test_structure_changes(self):
+        self.disk_list[1]["weekdays"] = ["Tue"]
+        self.assertTrue(self.merge()[1])
+
+    def test_recurrence_change_is_structure_change(self):
+        self.disk_list[1]["recurrence"] = {"type": "interval", "every": 2, "start": "2026-10-12"}
+        self.assertTrue(self.merge()[1])
+
+    def test_additions_removals_and_order(self):
+        self.disk_list.append(make_test_habit("d"))
+        self.disk_list.pop(0)
+        self.disk_list.reverse()
+
+        changed_habit_ids, structure_changed = self.merge()
+
+        self.assertEqual([habit["id"] for habit in self.habit_list], ["d", "c", "b"])
+        self.assertTrue(structure_changed)
+
+    def test_keeps_locally_edited_habit_deleted_on_disk(self):
+        self.disk_list.pop(0)
+        self.habit_list[0]["note"] = "local"
+
+        self.merge()
+
+        self.assertEqual(sorted(habit["id"] for habit in self.habit_list), ["a", "b", "c"])
+
+
+class HabitDaemonTests(unittest.TestCase):
+    """
+    Tests the routes of a HabitDaemon through a loopback client.
+    """
+
+    def setUp(self):
+        # The data files are read from and written to the working directory
+        self.old_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+        self.today = dt.datetime.today()
+        self.habits = [jh.make_habit("Read", "", jh.WEEKDAYS_MONDAY_FIRST, False),
+                       jh.make_habit("Run", "", jh.WEEKDAYS_MONDAY_FIRST, False, kind="duration", target=30)]
+        jh.write_habits_to_file(jh.HABIT_FILE_NAME, self.habits)
+        jh.write_streak_file(jh.STREAK_FILE_NAME, [self.today - dt.timedelta(days=1)])
+
+        # Serve on a free port from a thread of its own
+        self.daemon = jh.HabitDaemon(port=0)
+        self.loop = asyncio.new_event_loop()
+        self.serve_task = self.loop.create_task(self.daemon.serve())
+        self.thread = threading.Thread(target=self.run_daemon)
+        self.thread.start()
+
+        while self.daemon.port == 0:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.serve_task.cancel)
+        self.thread.join()
+        self.loop.close()
+
+        os.chdir(self.old_dir)
+        self.temp_dir.cleanup()
+
+    def run_daemon(self):
+        try:
+            self.loop.run_until_complete(self.serve_task)
+        except asyncio.CancelledError:
+            pass
+
+    def request(self, method, path, data=None):
+        return jh.request_daemon(method, path, data, port=self.daemon.port)
+
+    def send_raw(self, data):
+        """
+        Sends raw bytes to the daemon and returns the status line of the response.
+        return type: bytes
+        """
+
+        with socket.create_connection((jh.DAEMON_HOST, self.daemon.port), timeout=5) as connection:
+            connection.sendall(data)
+            return connection.makefile("rb").readline().strip()
+
+    def test_habits_today(self):
+        status, habits = self.request("GET", "/habits/today")
+
+        self.assertEqual(status, 200)
+        self.assertEqual([habit["id"] for habit in habits], [habit["id"] for habit in self.habits])
+
+    def test_check_extends_streak(self):
+        status, habit = self.request("POST", f"/habits/{self.habits[0]['id']}/check")
+
+        self.assertEqual(status, 200)
+        self.assertTrue(habit["checked"])
+
+        status, streak = self.request("GET", "/streak")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(streak["length"], 2)
+        self.assertEqual(streak["last_active_day"], self.today.strftime("%Y-%m-%d"))
+
+    def test_check_rejects_quantitative_habit(self):
+        status, payload = self.request("POST", f"/habits/{self.habits[1]['id']}/check")
+
+        self.assertEqual(status, 400)
+        self.assertEqual(self.request("GET", "/streak")[1]["length"], 1)
+        self.assertEqual(self.request("POST", "/habits/unknown/check")[0], 404)
+
+    def test_reorder(self):
+        status, habits = self.request("POST", "/habits/reorder", {"id": self.habits[1]["id"], "index": 0})
+
+        self.assertEqual(status, 200)
+        self.assertEqual([habit["name"] for habit in habits], ["Run", "Read"])
+        self.assertEqual(self.request("POST", "/habits/reorder", {"id": self.habits[1]["id"], "index": "0"})[0], 400)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.request("POST", "/habits/reorder", [1])[0], 400)
+        self.assertEqual(self.request("POST", "/sync/pull", {})[0], 400)
+        self.assertEqual(self.request("DELETE", "/habits")[0], 405)
+
+        self.assertEqual(self.send_raw(b"GARBAGE\r\n\r\n"), b"HTTP/1.1 400 Bad Request")
+        self.assertEqual(self.send_raw(b"POST /habits/reorder HTTP/1.1\r\nContent-Length: 1x\r\n\r\n"),
+                         b"HTTP/1.1 400 Bad Request")
+        self.assertEqual(self.send_raw(b"POST /habits/reorder HTTP/1.1\r\nContent-Length: 4\r\n\r\n{no}"),
+                         b"HTTP/1.1 400 Bad Request")
+        self.assertEqual(self.send_raw(b"POST /habits/reorder HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n"),
+                         b"HTTP/1.1 413 Content Too Large")
+
+    def test_sync_through_daemon(self):
+        transport = jh.HttpSyncTransport(port=self.daemon.port)
+        habit_list = []
+
+        jh.sync_habits(copy.deepcopy(self.habits), [self.today], make_sync_state("a" * 32), transport)
+        jh.sync_habits(habit_list, [self.today], make_sync_state("b" * 32), transport)
+
+        self.assertEqual([habit["name"] for habit in habit_list], ["Read", "Run"])
+
+    def test_sync_transport_raises_on_errors(self):
+        transport = jh.HttpSyncTransport(port=self.daemon.port)
+        sync_state = make_sync_state("not a replica id")
+
+        # A rejected delta leaves the sync state unchanged, so it is sent again
+        with self.assertRaises(ConnectionError):
+            jh.sync_habits(copy.deepcopy(self.habits), [self.today], sync_state, transport)
+        self.assertEqual(sync_state, make_sync_state("not a replica id"))
+
+        with self.assertRaises(ConnectionError):
+            transport.pull("a" * 32, None)
+
+    def test_unknown_paths_share_metrics(self):
+        for index in range(3):
+            self.assertEqual(self.request("GET", f"/unknown/{index}")[0], 404)
+
+        status, metrics = self.request("GET", "/metrics")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["unknown"]["count"], 3)
+        self.assertFalse(any(route.startswith("/unknown") for route in metrics))
+
+
+class SyncMergeTests(unittest.TestCase):
+    """
+    Tests that replicas merge deltas into the same state in any order.
+    """
+
+    def setUp(self):
+        self.day = dt.datetime(2026, 10, 18)
+        self.habits = [make_test_habit(name, f"{index:032x}") for index, name in enumerate(["Read", "Run", "Water"])]
+
+        # Both replicas start from the same synced habits
+        self.state_a = make_sync_state("a" * 32)
+        self.state_b = make_sync_state("b" * 32)
+        self.base_delta = jh.record_local_changes(self.habits, [self.day], self.state_a)
+        jh.apply_sync_delta(self.state_b, self.base_delta)
+
+    def diverge(self):
+        """
+        Changes the habits differently on both replicas and returns their deltas.
+        return type: tuple[dict, dict]
+        """
+
+        habits_a = copy.deepcopy(self.habits)
+        habits_a[0]["name"] = "Read a book"
+        habits_a.pop(2)
+        delta_a = jh.record_local_changes(habits_a, [self.day], self.state_a)
+
+        habits_b = copy.deepcopy(self.habits)
+        habits_b[0]["name"] = "Read the news"
+        habits_b[1]["note"] = "5 km"
+        habits_b.reverse()
+        delta_b = jh.record_local_changes(habits_b, [self.day + dt.timedelta(days=1)], self.state_b)
+
+        return delta_a, delta_b
+
+    def materialize(self, sync_state):
+        habit_list = []
+        active_streak_list = [self.day]
+        jh.materialize_sync_state(sync_state, habit_list, active_streak_list)
+        return habit_list, active_streak_list
+
+    def test_diverged_replicas_converge(self):
+        delta_a, delta_b = self.diverge()
+
+        jh.apply_sync_delta(self.state_a, delta_b)
+        jh.apply_sync_delta(self.state_b, delta_a)
+
+        self.assertEqual(self.materialize(self.state_a), self.materialize(self.state_b))
+
+    def test_delta_order_does_not_matter(self):
+        delta_a, delta_b = self.diverge()
+
+        # A third replica receives every delta, in every order and repeated
+        results = []
+        for deltas in ([self.base_delta, delta_a, delta_b],
+                       [delta_b, delta_a, self.base_delta],
+                       [delta_a, self.base_delta, delta_b, delta_a]):
+            state_c = make_sync_state("c" * 32)
+            for delta in deltas:
+                jh.apply_sync_delta(state_c, copy.deepcopy(delta))
+            results.append(self.materialize(state_c))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+    def test_merged_state(self):
+        delta_a, delta_b = self.diverge()
+        jh.apply_sync_delta(self.state_a, delta_b)
+        habit_list, active_streak_list = self.materialize(self.state_a)
+
+        # The deleted habit stays deleted, edits of different fields are both kept
+        self.assertEqual([habit["id"] for habit in habit_list], [self.habits[1]["id"], self.habits[0]["id"]])
+        self.assertEqual(habit_list[0]["note"], "5 km")
+        self.assertIn(habit_list[1]["name"], ("Read a book", "Read the news"))
+        self.assertEqual(len(active_streak_list), 2)
+
+    def test_checks_are_not_synced(self):
+        habits_a = copy.deepcopy(self.habits)
+        habits_a[0]["checked"] = True
+        delta_a = jh.record_local_changes(habits_a, [self.day], self.state_a)
+
+        self.assertEqual(delta_a["habits"], {})
+
+        # A check made on another day on replica A does not check the habit on replica B
+        habits_b = copy.deepcopy(self.habits)
+        jh.apply_sync_delta(self.state_b, delta_a)
+        jh.materialize_sync_state(self.state_b, habits_b, [self.day])
+
+        self.assertFalse(habits_b[0]["checked"])
+
+
+class SyncPositionTests(unittest.TestCase):
+    """
+    Tests that only uuid replica ids and positive sequence numbers are used as sync paths.
+    """
+
+    def test_valid_position(self):
+        self.assertTrue(jh.is_valid_sync_position("0123456789abcdef" * 2, 1))
+
+    def test_invalid_positions(self):
+        for replica_id, seq in (("../../escaped", 1), ("A" * 32, 1), ("a" * 31, 1), (None, 1),
+                                ("a" * 32, 0), ("a" * 32, "1"), ("a" * 32, True), ("a" * 32, 1.0)):
+            self.assertFalse(jh.is_valid_sync_position(replica_id, seq), (replica_id, seq))
+
+    def test_directory_transport(self):
+        with tempfile.TemporaryDirectory() as sync_dir:
+            transport = jh.DirectorySyncTransport(sync_dir)
+
+            with self.assertRaises(ValueError):
+                transport.push("../escaped", 1, {})
+
+            # Files that are not deltas of a replica are not pulled
+            transport.push("a" * 32, 1, {"habits": {}})
+            os.makedirs(os.path.join(sync_dir, "notes"))
+            with open(os.path.join(sync_dir, "a" * 32, "readme.json"), "w") as file:
+                file.write("{}")
+
+            self.assertEqual(transport.pull("b" * 32, {}), [("a" * 32, 1, {"habits": {}})])
+            self.assertEqual(sorted(os.listdir(sync_dir)), ["a" * 32, "notes"])
+
+
+class UnorderedIndicesTests(unittest.TestCase):
+    """
+    Tests get_unordered_indices.
+    """
+
+    def test_sorted_positions(self):
+        self.assertEqual(jh.get_unordered_indices([0.0, 1.0, 2.0]), set())
+
+    def test_moved_position(self):
+        self.assertEqual(jh.get_unordered_indices([3.0, 0.0, 1.0, 2.0]), {0})
+        self.assertEqual(jh.get_unordered_indices([1.0, 2.0, 3.0, 0.0]), {3})
+
+    def test_missing_positions(self):
+        self.assertEqual(jh.get_unordered_indices([None, 0.0, None, 1.0]), {0, 2})
+        self.assertEqual(jh.get_unordered_indices([]), set())
+
+    def test_keeps_longest_run(self):
+        position_list = [5.0, 1.0, 2.0, 6.0, 3.0, 4.0]
+        unordered_indices = jh.get_unordered_indices(position_list)
+        kept = [position for index, position in enumerate(position_list) if index not in unordered_indices]
+
+        self.assertEqual(kept, sorted(kept))
+        self.assertEqual(len(kept), 4)
+
+
+class NextOccurrenceTests(unittest.TestCase):
+    """
+    Tests get_next_occurrence for every recurrence rule type.
+    """
+
+    def setUp(self):
+        self.monday = dt.date(2026, 10, 12).toordinal()
+
+    def make_habit(self, recurrence):
+        return make_test_habit("Habit", recurrence=recurrence)
+
+    def test_weekdays(self):
+        habit = self.make_habit({"type": "weekdays", "weekdays": ["Wed", "Sat"]})
+
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday), self.monday + 2)
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday + 3), self.monday + 5)
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday + 6), self.monday + 9)
+
+    def test_no_weekdays(self):
+        habit = self.make_habit({"type": "weekdays", "weekdays": []})
+
+        self.assertIsNone(jh.get_next_occurrence(habit, self.monday))
+
+    def test_interval(self):
+        habit = self.make_habit({"type": "interval", "every": 3, "start": "2026-10-12"})
+
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday), self.monday)
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday + 1), self.monday + 3)
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday - 10), self.monday)
+
+    def test_month_days(self):
+        habit = self.make_habit({"type": "month_days", "days": [1, 31]})
+
+        self.assertEqual(jh.get_next_occurrence(habit, dt.date(2026, 10, 12).toordinal()),
+                         dt.date(2026, 10, 31).toordinal())
+        self.assertEqual(jh.get_next_occurrence(habit, dt.date(2026, 11, 2).toordinal()),
+                         dt.date(2026, 12, 1).toordinal())
+
+    def test_times_per_week(self):
+        habit = self.make_habit({"type": "times_per_week", "times": 2})
+
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday), self.monday)
+
+        # Once completed twice this week, the habit is next due next Monday
+        habit["week_checks"] = {"week": "2026-10-12", "count": 2, "last_day": "2026-10-13"}
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday + 1), self.monday + 1)
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday + 2), self.monday + 7)
+
+    def test_end_date(self):
+        habit = self.make_habit({"type": "weekdays", "weekdays": ["Mon"], "end": "2026-10-18"})
+
+        self.assertEqual(jh.get_next_occurrence(habit, self.monday), self.monday)
+        self.assertIsNone(jh.get_next_occurrence(habit, self.monday + 1))
+
+    def test_invalid_rules(self):
+        # An interval without a start date would be due on whichever day it is checked from
+        for recurrence in ({"type": "interval", "every": 3}, {"type": "yearly"}):
+            with self.assertRaises(ValueError):
+                jh.compile_recurrence_rule(recurrence)
+            self.assertIsNone(jh.get_next_occurrence(self.make_habit(recurrence), self.monday))
+
+    def test_index_follows_changed_habits(self):
+        first = make_test_habit("First")
+        second = make_test_habit("Second", recurrence={"type": "interval", "every": 3, "start": "2026-10-12"})
+        habit_list = [first, second]
+        monday = dt.datetime(2026, 10, 12)
+        index = jh.RecurrenceIndex(habit_list, monday, monday + dt.timedelta(days=6))
+
+        self.assertEqual(index.get_due_habits(monday), [first, second])
+
+        habit_list.reverse()
+        first["weekdays"] = ["Tue"]
+        index.update(habit_list)
+        self.assertEqual(index.get_due_habits(monday), [second])
+        self.assertEqual(index.get_due_habits(monday + dt.timedelta(days=1)), [first])
+
+        habit_list.remove(second)
+        index.update(habit_list)
+        self.assertEqual(index.get_due_habits(monday + dt.timedelta(days=3)), [])
+
+    def test_streak_skips_days_without_due_habits(self):
+        habit_list = [make_test_habit("Habit")]
+
+        # Only Monday 19 was missed, which is within the grace period
+        active_streak_list = [dt.datetime(2026, 10, 12)]
+        jh.manage_streak(active_streak_list, dt.datetime(2026, 10, 26), habit_list=habit_list)
+        self.assertEqual(active_streak_list, [dt.datetime(2026, 10, 12)])
+
+        active_streak_list = [dt.datetime(2026, 10, 12)]
+        jh.manage_streak(active_streak_list, dt.datetime(2026, 10, 27), habit_list=habit_list)
+        self.assertEqual(active_streak_list, [dt.datetime(2026, 10, 27)])
+
+
+class ImportExportTests(unittest.TestCase):
+    """
+    Tests that exported habits and check-ins import back unchanged.
+    """
+
+    def setUp(self):
+        # The data files are read from and written to the working directory
+        self.old_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+        today = dt.datetime.today()
+        self.days = sorted({(today - dt.timedelta(days=days)).strftime("%Y-%m-%d") for days in (0, 40, 400, 800)})
+        self.rows = [{"type": "habit", "name": "Read", "note": "10 pages", "weekdays": ["Mon", "Thu"]},
+                     {"type": "habit", "name": "Run", "recurrence": {"type": "interval", "every": 2, "start": "2026-01-01"}},
+                     *({"type": "checkin", "date": day} for day in self.days)]
+
+        with open("import.jsonl", "w") as file:
+            for row in self.rows:
+                file.write(json.dumps(row))
+                file.write("\n")
+
+    def tearDown(self):
+        os.chdir(self.old_dir)
+        self.temp_dir.cleanup()
+
+    def run_quietly(self, function, filename):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            function(filename)
+
+    def read_json_lines(self, filename):
+        with open(filename, "r") as file:
+            return [json.loads(line) for line in file]
+
+    def test_json_lines_round_trip(self):
+        self.run_quietly(jh.run_import, "import.jsonl")
+        self.run_quietly(jh.run_export, "export.jsonl")
+        exported_rows = self.read_json_lines("export.jsonl")
+
+        habit_rows = [row for row in exported_rows if row["type"] == "habit"]
+        self.assertEqual([row["name"] for row in habit_rows], ["Read", "Run"])
+        self.assertEqual(habit_rows[0]["weekdays"], ["Mon", "Thu"])
+        self.assertEqual(habit_rows[1]["recurrence"], self.rows[1]["recurrence"])
+        self.assertEqual([row["date"] for row in exported_rows if row["type"] == "checkin"], self.days)
+
+        # Importing the export again changes nothing
+        self.run_quietly(jh.run_import, "export.jsonl")
+        self.run_quietly(jh.run_export, "export_again.jsonl")
+        self.assertEqual(self.read_json_lines("export_again.jsonl"), exported_rows)
+
+    def test_csv_round_trip(self):
+        self.run_quietly(jh.run_import, "import.jsonl")
+        self.run_quietly(jh.run_export, "export.jsonl")
+        self.run_quietly(jh.run_export, "export.csv")
+
+        # Import the csv export into an empty data directory
+        os.mkdir("copy")
+        os.chdir("copy")
+        self.run_quietly(jh.run_import, os.path.join("..", "export.csv"))
+        self.run_quietly(jh.run_export, "export.jsonl")
+
+        self.assertEqual(self.read_json_lines("export.jsonl"), self.read_json_lines(os.path.join("..", "export.jsonl")))
+
+    def test_skips_invalid_rows(self):
+        with open("invalid.jsonl", "w") as file:
+            file.write("not json\n")
+            file.write(json.dumps({"type": "habit", "name": ""}) + "\n")
+            file.write(json.dumps({"type": "habit", "name": "Walk", "weekdays": ["Someday"]}) + "\n")
+            file.write(json.dumps({"type": "checkin", "date": "2026-13-01"}) + "\n")
+            file.write(json.dumps({"type": "habit", "name": "Walk"}) + "\n")
+
+        self.run_quietly(jh.run_import, "invalid.jsonl")
+        self.run_quietly(jh.run_export, "export.jsonl")
+
+        self.assertEqual([row["name"] for row in self.read_json_lines("export.jsonl") if row["type"] == "habit"], ["Walk"])
+
+    def test_rejects_invalid_recurrence_rules(self):
+        for recurrence in ({"type": "bogus"},
+                           {"type": "interval", "every": 2},
+                           {"type": "interval", "every": 0, "start": "2026-01-01"},
+                           {"type": "times_per_week"},
+                           {"type": "month_days", "days": [32]},
+                           {"type": "weekdays", "weekdays": ["Someday"]},
+                           {"type": "weekdays", "weekdays": ["Mon"], "end": "2026-13-01"}):
+            with self.assertRaises(ValueError):
+                jh.parse_import_habit({"name": "Walk", "recurrence": recurrence})
+
+        habit = jh.parse_import_habit({"name": "Walk", "recurrence": json.dumps({"type": "month_days", "days": [1, 31]})})
+        self.assertEqual(habit["recurrence"], {"type": "month_days", "days": [1, 31]})
+
+    def test_loads_imported_values(self):
+        with open("values.jsonl", "w") as file:
+            file.write(json.dumps({"type": "habit", "id": "run", "name": "Run", "kind": "duration", "target": 30}) + "\n")
+            file.write(json.dumps({"type": "value", "id": "run", "date": "2026-10-01", "value": 25}) + "\n")
+
+        self.run_quietly(jh.run_import, "values.jsonl")
+        value_columns = jh.load_data_files(dt.datetime.today())[3]
+
+        self.assertEqual(value_columns["run"].get_value(dt.date(2026, 10, 1).toordinal()), 25)
+
+    def test_keeps_current_month_days_before_the_streak(self):
+        streak_index = jh.read_streak_index(jh.ARCHIVE_DIR_NAME)
+        active_streak_list = [dt.datetime(2026, 10, 10), dt.datetime(2026, 10, 11)]
+
+        jh.write_activity_batch(jh.ARCHIVE_DIR_NAME,
+                                {"2026-09-30", "2026-10-01", "2026-10-12"},
+                                active_streak_list,
+                                streak_index,
+                                dt.datetime(2026, 10, 18))
+
+        self.assertEqual(streak_index["detached_days"], ["2026-10-01"])
+        self.assertEqual(active_streak_list[-1], dt.datetime(2026, 10, 12))
+        self.assertEqual(jh.read_activity_history(jh.ARCHIVE_DIR_NAME, 2026, active_streak_list, streak_index),
+                         [dt.datetime(2026, 9, 30), dt.datetime(2026, 10, 1), dt.datetime(2026, 10, 10),
+                          dt.datetime(2026, 10, 11), dt.datetime(2026, 10, 12)])
+
+
+class HabitValueColumnTests(unittest.TestCase):
+    """
+    Tests that the rolling sums of HabitValueColumn match summing every day.
+    """
+
+    def assert_sums(self, column, day_values, today_ordinal):
+        for window in jh.ROLLING_WINDOWS:
+            expected = sum(value for ordinal, value in day_values.items()
+                           if today_ordinal - window < ordinal <= today_ordinal)
+            self.assertEqual(column.sums[window], expected)
+
+    def test_advance_to(self):
+        today = dt.datetime(2026, 10, 18)
+        column = jh.HabitValueColumn(today)
+        day_values = {}
+
+        generator = random.Random(1)
+        for _ in range(500):
+            ordinal = today.toordinal() + generator.randint(-400, 5)
+            day_values[ordinal] = column.add_value(ordinal, generator.randint(-2, 6))
+
+        self.assert_sums(column, day_values, today.toordinal())
+
+        for days in (1, 1, 6, 30, 200, 400):
+            today += dt.timedelta(days=days)
+            column.advance_to(today)
+            self.assert_sums(column, day_values, today.toordinal())
+
+    def test_values_do_not_go_below_zero(self):
+        today = dt.datetime(2026, 10, 18)
+        column = jh.HabitValueColumn(today)
+
+        self.assertEqual(column.add_value(today.toordinal(), 3), 3)
+        self.assertEqual(column.add_value(today.toordinal(), -5), 0)
+        self.assertEqual(column.sums[7], 0)
+
+    def test_merge_keeps_local_decrement(self):
+        today = dt.datetime(2026, 10, 18)
+        column = jh.HabitValueColumn(today, today.toordinal(), [5])
+        column.add_value(today.toordinal(), -2)
+        disk_column = jh.HabitValueColumn(today, today.toordinal() - 1, [4, 5])
+
+        value_columns = {"habit": column}
+        jh.merge_value_columns({"habit": disk_column}, value_columns)
+
+        self.assertEqual(column.get_value(today.toordinal()), 3)
+        self.assertEqual(column.get_value(today.toordinal() - 1), 4)
+
+    def test_merge_compares_against_merged_values(self):
+        today = dt.datetime(2026, 10, 18)
+        column = jh.HabitValueColumn(today, today.toordinal(), [5])
+        disk_column = jh.HabitValueColumn(today, today.toordinal(), [7])
+
+        self.assertEqual(jh.merge_value_columns({"habit": disk_column}, {"habit": column}), {"habit"})
+        self.assertEqual(column.get_value(today.toordinal()), 7)
+
+        # Going back to the old value is a local change the next merge keeps
+        column.add_value(today.toordinal(), -2)
+
+        self.assertEqual(jh.merge_value_columns({"habit": disk_column}, {"habit": column}), set())
+        self.assertEqual(column.get_value(today.toordinal()), 5)
+
+
+class RecordHabitValueTests(unittest.TestCase):
+    """
+    Tests that quantitative habits are checked once they reach their target.
+    """
+
+    def test_extends_streak_at_target(self):
+        today = dt.datetime(2026, 10, 18)
+        habit = jh.make_habit("Read", "", ["Sun"], False, kind="duration", target=30)
+        active_streak_list = [today - dt.timedelta(days=1)]
+        value_columns = {}
+
+        self.assertEqual(jh.record_habit_value(habit, 5, value_columns, active_streak_list, today), 5)
+        self.assertFalse(habit["checked"])
+        self.assertEqual(len(active_streak_list), 1)
+
+        self.assertEqual(jh.record_habit_value(habit, 25, value_columns, active_streak_list, today), 30)
+        self.assertTrue(habit["checked"])
+        self.assertEqual(active_streak_list[-1], today)
+
+        self.assertEqual(jh.record_habit_value(habit, -5, value_columns, active_streak_list, today), 25)
+        self.assertFalse(habit["checked"])
+
+
+if __name__ == "__main__":
+    unittest.main()